@@ -1,8 +1,20 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Response
-from fastapi.responses import JSONResponse, FileResponse
-from app.models.schemas import FlowchartRequest
+from fastapi import APIRouter, UploadFile, File, HTTPException, Response, Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.models.schemas import FlowchartRequest, ImpactRequest
 from app.services.generator import FlowchartGenerator
+from app.services.response_cache import ResponseCache
+from app.services.graph_encoding import negotiate_media_type, negotiate_encoding, encode_graph, compress
+from app.services.graph_diff import diff_graphs
+from app.services.graph_exporters import EXPORTERS
+from app.services.impact_index import ImpactIndex
+from app.services.job_manager import JobManager, JobQueueFull, COMPLETED, FINISHED_STATES
+from typing import Optional
+import asyncio
+import json
 import os
+import time
 from app.services.project_analyzer import ProjectAnalyzer
 import tempfile
 import shutil
@@ -11,13 +23,55 @@ import networkx as nx
 
 router = APIRouter()
 
+# Shared across requests; set RESPONSE_CACHE_DIR to share entries between workers
+response_cache = ResponseCache(
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    cache_dir=os.getenv("RESPONSE_CACHE_DIR"),
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 256))
+)
+
+def _cached_flowchart(content: str, input_type: str, if_none_match: Optional[str],
+                      store_analysis: bool = False) -> Response:
+    """Serve a flowchart from the response cache, generating it only on a miss."""
+    key = response_cache.make_key(content, input_type)
+    etag = response_cache.etag_for(key)
+
+    # An upload must also leave its graph in place for exports; when that graph
+    # is no longer in memory, fall through and regenerate it instead of a 304
+    entry = response_cache.peek(key)
+    can_skip = not store_analysis or (entry is not None and entry.graph is not None)
+    if can_skip and response_cache.etag_matches(if_none_match, key):
+        response_cache.record_not_modified(key)
+        if store_analysis:
+            router.current_analysis = entry.graph
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # Entries loaded from the shared directory have no graph to export
+    entry = response_cache.get(key, require_graph=store_analysis)
+    cache_status = "HIT"
+    if entry is None:
+        generator = FlowchartGenerator()
+        result = generator.generate_flowchart(content, input_type)
+        body = json.dumps(jsonable_encoder(result)).encode()
+        entry = response_cache.put(key, body, generator.parser.graph)
+        cache_status = "MISS"
+
+    if store_analysis:
+        # Store the analysis result
+        router.current_analysis = entry.graph
+
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers={"ETag": etag, "X-Cache": cache_status}
+    )
+
 @router.post("/generate-flowchart/")
-async def generate_flowchart(request: FlowchartRequest):
-    generator = FlowchartGenerator()
-    return generator.generate_flowchart(request.content, request.input_type)
+async def generate_flowchart(request: FlowchartRequest, if_none_match: Optional[str] = Header(None)):
+    return _cached_flowchart(request.content, request.input_type, if_none_match)
 
 @router.post("/upload-file/")
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(file: UploadFile = File(...), if_none_match: Optional[str] = Header(None)):
     content = await file.read()
     content_str = content.decode()
     
@@ -28,20 +82,58 @@ async def upload_file(file: UploadFile = File(...)):
     
     input_type = 'python' if input_type == 'py' else 'yaml' if input_type in ['yaml', 'yml'] else 'text'
     
-    generator = FlowchartGenerator()
+    return _cached_flowchart(content_str, input_type, if_none_match, store_analysis=True)
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Report response cache hit ratio and bytes saved."""
+    return response_cache.stats()
+
 
-    result = generator.generate_flowchart(content_str, input_type)
-    
-    # Store the analysis result
-    router.current_analysis = generator.parser.graph
-    
-    return result
 
 
+def _graph_response(graph: nx.DiGraph, request: Request) -> Response:
+    """Encode a graph in the format and compression the client asked for."""
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    body = encode_graph(graph, media_type)
+    body, encoding = compress(body, negotiate_encoding(request.headers.get("accept-encoding")))
 
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+async def _stream_export(graph: nx.DiGraph, format: str) -> StreamingResponse:
+    """Stream a graph through one of the EXPORTERS writers."""
+    writer, media_type = EXPORTERS[format]
+    # Producing the first chunk scans the attributes, so most failures
+    # surface here, while an error status can still be sent
+    try:
+        chunks = writer(graph)
+        first = await run_in_threadpool(next, chunks, "")
+    except Exception as e:
+        print(f"Error during export: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def body():
+        yield first
+        try:
+            yield from chunks
+        except Exception as e:
+            # Headers are already sent; log and abort so the download is visibly incomplete
+            print(f"Error during export: {str(e)}")
+            raise
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=code_analysis.{format}"
+        }
+    )
 
 @router.post("/analyze-project/")
-async def analyze_project(file: UploadFile = File(...)):
+async def analyze_project(request: Request, file: UploadFile = File(...)):
     """Analyze a zipped project directory."""
     print(f"Analyzing project from file: {file.filename}")  # Debug log
     
@@ -61,31 +153,121 @@ async def analyze_project(file: UploadFile = File(...)):
         analyzer = ProjectAnalyzer()
         graph = analyzer.analyze_project(project_dir)
         
-        # Convert to response format
-        response = {
-            "nodes": [
-                {
-                    "id": node,
-                    "label": node,
-                    "type": data.get("type", "default"),
-                    "metadata": data.get("metadata", {})
-                }
-                for node, data in graph.nodes(data=True)
-            ],
-            "edges": [
-                {
-                    "source": source,
-                    "target": target,
-                    "type": data.get("type", "default")
-                }
-                for source, target, data in graph.edges(data=True)
-            ]
-        }
-        
-        print(f"Analysis complete. Found {len(response['nodes'])} nodes and {len(response['edges'])} edges")  # Debug log
-        return response
+        print(f"Analysis complete. Found {graph.number_of_nodes()} nodes and {graph.number_of_edges()} edges")  # Debug log
+        return _graph_response(graph, request)
     
     
+job_manager = JobManager(
+    max_concurrent=int(os.getenv("JOBS_MAX_CONCURRENT", 2)),
+    max_pending=int(os.getenv("JOBS_MAX_PENDING", 16)),
+    result_ttl=float(os.getenv("JOBS_RESULT_TTL", 3600))
+)
+
+def _get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+@router.post("/jobs/", status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    """Queue a zipped project for background analysis and return its job ID."""
+    # Refuse before writing the archive to disk; submit() checks again in case others got in first
+    try:
+        job_manager.check_capacity()
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    work_dir = job_manager.create_work_dir()
+    archive_path = os.path.join(work_dir, "project.zip")
+    try:
+        with open(archive_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+        job = job_manager.submit(work_dir, archive_path)
+    except JobQueueFull as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+    return job.snapshot()
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    return _get_job(job_id).snapshot()
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """Stream job progress as Server-Sent Events until the job finishes."""
+    job = _get_job(job_id)
+
+    async def events():
+        last_version = -1
+        last_sent = time.monotonic()
+        while not await request.is_disconnected():
+            if job.version != last_version:
+                last_version = job.version
+                snapshot = job.snapshot()
+                finished = snapshot['status'] in FINISHED_STATES
+                event = "done" if finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n"
+                last_sent = time.monotonic()
+                if finished:
+                    break
+            elif time.monotonic() - last_sent > 15:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(job_id: str, request: Request):
+    job = _get_job(job_id)
+    if job.status != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return _graph_response(job.result, request)
+
+@router.get("/jobs/{base_id}/diff/{head_id}")
+async def diff_jobs(base_id: str, head_id: str):
+    """Compare two completed analyses, e.g. a PR's base and head."""
+    jobs = [_get_job(base_id), _get_job(head_id)]
+    for job in jobs:
+        if job.status != COMPLETED:
+            raise HTTPException(status_code=409, detail=f"Job {job.id} is {job.status}")
+    return await run_in_threadpool(diff_graphs, jobs[0].result, jobs[1].result)
+
+@router.post("/jobs/{job_id}/impact")
+async def job_impact(job_id: str, request: ImpactRequest):
+    """Find the tests and entry points that transitively call the changed files or symbols."""
+    job = _get_job(job_id)
+    if job.status != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    # The job builds the index; fall back to a worker thread if it is missing
+    index = await run_in_threadpool(ImpactIndex.for_graph, job.result)
+    return await run_in_threadpool(index.query, request.files, request.symbols)
+
+@router.get("/jobs/{job_id}/export/{format}")
+async def export_job(job_id: str, format: str):
+    """Stream a completed project analysis as GraphML, DOT or GEXF."""
+    job = _get_job(job_id)
+    if job.status != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if format not in EXPORTERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+    return await _stream_export(job.result, format)
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job and remove its temporary files."""
+    _get_job(job_id)
+    return job_manager.cancel(job_id).snapshot()
+
 @router.get("/export/{format}")
 async def export_graph(format: str):
     """Export the current graph in various formats."""
@@ -116,6 +298,10 @@ async def export_graph(format: str):
             }
             return JSONResponse(content=graph_data)
 
+        elif format in EXPORTERS:
+            # Streamed straight from the stored graph, without matplotlib
+            return await _stream_export(router.current_analysis, format)
+
         elif format in ["svg", "png"]:
             import matplotlib.pyplot as plt
             import matplotlib.patches as mpatches
@@ -154,7 +340,8 @@ async def export_graph(format: str):
             edge_styles = {
                 'contains': {'style': 'solid', 'color': '#94a3b8', 'width': 2},
                 'calls': {'style': 'solid', 'color': '#6366f1', 'width': 1},
-                'import': {'style': 'dashed', 'color': '#10b981', 'width': 1}
+                'import': {'style': 'dashed', 'color': '#10b981', 'width': 1},
+                'similar_to': {'style': 'dotted', 'color': '#f97316', 'width': 1}
             }
             
             # Draw edges
@@ -215,6 +402,9 @@ async def export_graph(format: str):
                 }
             )
 
+    except HTTPException:
+        # Already reported by _stream_export
+        raise
     except Exception as e:
         print(f"Error during export: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""Headless command line interface for project analysis.
+
+Runs ProjectAnalyzer directly on local directories, without the HTTP layer:
+
+    python -m app.cli path/to/project --workers 4 --format ndjson --max-complexity 15
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, IO, List
+
+import networkx as nx
+
+from app.services.impact_index import ImpactIndex
+from app.services.project_analyzer import ProjectAnalyzer
+
+EXIT_OK = 0
+EXIT_THRESHOLD_EXCEEDED = 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="codeflow",
+        description="Analyze Python projects and write the code graph as JSON or NDJSON."
+    )
+    parser.add_argument("paths", nargs="+", help="project directories to analyze")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="number of worker processes used to parse files (default: 1)")
+    parser.add_argument("--include", action="append", default=None, metavar="GLOB",
+                        help="only analyze files matching this glob; repeatable (default: *.py)")
+    parser.add_argument("--exclude", action="append", default=None, metavar="GLOB",
+                        help="skip files and directories matching this glob; repeatable")
+    parser.add_argument("--cache-dir", help="directory for persistent per-file analysis results")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json",
+                        help="output format (default: json)")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--max-complexity", type=int,
+                        help="exit non-zero if any function is more complex than this")
+    parser.add_argument("--max-dead-code", type=int,
+                        help="exit non-zero if more functions than this look like dead code")
+    parser.add_argument("--changed", action="append", default=None, metavar="FILE_OR_SYMBOL",
+                        help="report tests and entry points affected by this changed .py file "
+                             "or symbol in the summary; repeatable")
+    return parser
+
+
+def summarize(graph: nx.DiGraph) -> Dict:
+    """Collect the counts used for reporting and threshold checks."""
+    functions = [
+        (node, data.get('metadata', {}))
+        for node, data in graph.nodes(data=True)
+        if data.get('type') in ['function', 'method']
+    ]
+    return {
+        'files': sum(1 for _, data in graph.nodes(data=True) if data.get('type') == 'file'),
+        'functions': len(functions),
+        'nodes': graph.number_of_nodes(),
+        'edges': graph.number_of_edges(),
+        'max_complexity': max((metadata.get('complexity', 0) for _, metadata in functions), default=0),
+        'dead_code': sorted(node for node, metadata in functions if metadata.get('is_dead_code')),
+        'duplicates': sorted(node for node, metadata in functions if metadata.get('duplicate_of'))
+    }
+
+
+def check_thresholds(graph: nx.DiGraph, summary: Dict, args: argparse.Namespace) -> List[str]:
+    """Return a message for every exceeded threshold."""
+    violations = []
+    if args.max_complexity is not None:
+        for node, data in graph.nodes(data=True):
+            complexity = data.get('metadata', {}).get('complexity', 0)
+            if data.get('type') in ['function', 'method'] and complexity > args.max_complexity:
+                violations.append(f"{node}: complexity {complexity} exceeds {args.max_complexity}")
+    if args.max_dead_code is not None and len(summary['dead_code']) > args.max_dead_code:
+        violations.append(
+            f"{len(summary['dead_code'])} dead code functions exceed the limit of {args.max_dead_code}"
+        )
+    return violations
+
+
+def _node_record(node: str, data: Dict) -> Dict:
+    return {
+        "id": node,
+        "label": node,
+        "type": data.get("type", "default"),
+        "metadata": data.get("metadata", {})
+    }
+
+
+def _edge_record(source: str, target: str, data: Dict) -> Dict:
+    return {
+        "source": source,
+        "target": target,
+        "type": data.get("type", "default")
+    }
+
+
+def write_ndjson(out: IO, path: str, graph: nx.DiGraph, summary: Dict):
+    """Write one JSON object per line, so consumers can process records as they arrive."""
+    for node, data in graph.nodes(data=True):
+        out.write(json.dumps({"record": "node", "project": path, **_node_record(node, data)}) + "\n")
+    for source, target, data in graph.edges(data=True):
+        out.write(json.dumps({"record": "edge", "project": path, **_edge_record(source, target, data)}) + "\n")
+    out.write(json.dumps({"record": "summary", "project": path, **summary}) + "\n")
+
+
+def write_json_project(out: IO, path: str, graph: nx.DiGraph, summary: Dict):
+    """Write one project object item by item instead of building the whole document."""
+    out.write('{"path": %s, "nodes": [' % json.dumps(path))
+    for index, (node, data) in enumerate(graph.nodes(data=True)):
+        out.write(("," if index else "") + "\n" + json.dumps(_node_record(node, data)))
+    out.write('\n], "edges": [')
+    for index, (source, target, data) in enumerate(graph.edges(data=True)):
+        out.write(("," if index else "") + "\n" + json.dumps(_edge_record(source, target, data)))
+    out.write('\n], "summary": %s}' % json.dumps(summary))
+
+
+def _open_output(destination: str) -> IO:
+    # Analyzer diagnostics go to stderr, so stdout carries only results
+    if destination == "-":
+        return sys.stdout
+    return open(destination, "w", encoding="utf-8")
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    for path in args.paths:
+        if not os.path.isdir(path):
+            print(f"codeflow: not a directory: {path}", file=sys.stderr)
+            return 2
+
+    out = _open_output(args.output)
+    violations = []
+    try:
+        if args.format == "json":
+            out.write('{"projects": [\n')
+        for index, path in enumerate(args.paths):
+            analyzer = ProjectAnalyzer()
+            graph = analyzer.analyze_project(
+                path,
+                include=args.include,
+                exclude=args.exclude,
+                workers=args.workers,
+                cache_dir=args.cache_dir
+            )
+            summary = summarize(graph)
+            project_violations = check_thresholds(graph, summary, args)
+            summary['violations'] = project_violations
+            if args.changed:
+                changed_files = [name for name in args.changed if name.endswith('.py')]
+                changed_symbols = [name for name in args.changed if not name.endswith('.py')]
+                summary['impact'] = ImpactIndex(graph).query(files=changed_files, symbols=changed_symbols)
+            violations.extend(f"{path}: {message}" for message in project_violations)
+
+            if args.format == "ndjson":
+                write_ndjson(out, path, graph, summary)
+            else:
+                if index:
+                    out.write(",\n")
+                write_json_project(out, path, graph, summary)
+            out.flush()
+        if args.format == "json":
+            out.write("\n]}\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    for message in violations:
+        print(f"codeflow: {message}", file=sys.stderr)
+    return EXIT_THRESHOLD_EXCEEDED if violations else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
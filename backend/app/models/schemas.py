@@ -14,4 +14,8 @@ class FlowchartEdge(BaseModel):
 
 class FlowchartRequest(BaseModel):
     content: str
-    input_type: str
\ No newline at end of file
+    input_type: str
+
+class ImpactRequest(BaseModel):
+    files: List[str] = []
+    symbols: List[str] = []
\ No newline at end of file
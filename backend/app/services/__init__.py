@@ -0,0 +1,2 @@
+# Bump whenever analysis output changes so cached results are invalidated
+ANALYZER_VERSION = "4"
@@ -0,0 +1,50 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, Optional
+
+from . import ANALYZER_VERSION
+
+
+class AnalysisCache:
+    """Persistent per-file analysis results stored in a local directory.
+
+    Keys cover the analyzer version, the file name (used as the graph node id)
+    and the file content, so edited files and analyzer upgrades miss the cache.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(file_name: str, content: bytes) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{ANALYZER_VERSION}\0{file_name}\0".encode())
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, result: Dict):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so concurrent workers never read partial entries
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error writing analysis cache entry {key}: {str(e)}", file=sys.stderr)
+
+    def _path(self, key: str) -> str:
+        # Fan out into subdirectories so huge projects don't create one giant directory
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
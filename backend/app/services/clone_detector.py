@@ -0,0 +1,160 @@
+import ast
+import hashlib
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Constants for the one-permutation MinHash signature
+_MASK_64 = (1 << 64) - 1
+_MIX_MULTIPLIER = 0x9E3779B97F4A7C15
+_EMPTY_BIN = 1 << 64
+_BORROW_OFFSET = 1 << 58
+
+
+class CloneDetector:
+    """Find copy-pasted functions using normalized AST fingerprints.
+
+    Exact clones are grouped by a hash of the normalized AST. Near clones are
+    found with MinHash signatures bucketed by locality-sensitive hashing, so
+    only functions sharing a bucket are ever compared.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 4,
+                 threshold: float = 0.8, min_tokens: int = 40, max_bucket_size: int = 50):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+        self.max_bucket_size = max_bucket_size
+
+        self.exact_groups: Dict[str, List[str]] = defaultdict(list)
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+
+    def add_function(self, function_id: str, node: ast.AST):
+        """Fingerprint a function and register it for clone detection."""
+        fingerprint = self.fingerprint(node)
+        if fingerprint is not None:
+            self.add_fingerprint(function_id, *fingerprint)
+
+    def fingerprint(self, node: ast.AST) -> Optional[Tuple[str, Tuple[int, ...]]]:
+        """Return (exact hash, MinHash signature) for a function, or None if it is too small."""
+        tokens = self.normalize(node)
+        if len(tokens) < self.min_tokens:
+            return None
+        digest = hashlib.sha1(" ".join(tokens).encode()).hexdigest()
+        return digest, self._minhash(tokens)
+
+    def add_fingerprint(self, function_id: str, digest: str, signature: Tuple[int, ...]):
+        """Register a precomputed fingerprint, e.g. one produced in a worker process."""
+        group = self.exact_groups[digest]
+        group.append(function_id)
+        # Only the first copy of an exact clone takes part in near-clone search;
+        # when several files define the same name, the first definition keeps its signature
+        if len(group) == 1:
+            self.signatures.setdefault(function_id, tuple(signature))
+
+    def normalize(self, node: ast.AST) -> List[str]:
+        """Flatten an AST into node-type tokens with identifiers and literals abstracted."""
+        tokens = []
+
+        def visit(current: ast.AST):
+            tokens.append(type(current).__name__)
+            if isinstance(current, ast.Constant):
+                # Keep the literal's type, drop its value
+                tokens.append(type(current.value).__name__)
+
+            body = getattr(current, 'body', None)
+            for field, value in ast.iter_fields(current):
+                if isinstance(value, list):
+                    for index, item in enumerate(value):
+                        if not isinstance(item, ast.AST):
+                            continue
+                        if value is body and index == 0 and self._is_docstring(item):
+                            continue
+                        visit(item)
+                elif isinstance(value, ast.AST):
+                    visit(value)
+            tokens.append(")")
+
+        visit(node)
+        return tokens
+
+    def find_clones(self) -> Tuple[Dict[str, str], List[Tuple[str, str, float]]]:
+        """Return exact clones as {copy: original} and near clones as (a, b, similarity)."""
+        duplicate_of = {}
+        for group in self.exact_groups.values():
+            original = group[0]
+            for copy in group[1:]:
+                if copy != original:
+                    duplicate_of[copy] = original
+
+        buckets = defaultdict(list)
+        for function_id, signature in self.signatures.items():
+            for band in range(self.bands):
+                start = band * self.rows
+                buckets[(band, signature[start:start + self.rows])].append(function_id)
+
+        candidates = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_bucket_size:
+                # Degenerate bucket: link every member to the first to stay linear
+                head = members[0]
+                candidates.update((head, other) for other in members[1:])
+                continue
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    candidates.add((first, second))
+
+        similar = []
+        for first, second in candidates:
+            similarity = self._similarity(self.signatures[first], self.signatures[second])
+            if similarity >= self.threshold:
+                similar.append((first, second, similarity))
+
+        return duplicate_of, similar
+
+    def _minhash(self, tokens: List[str]) -> Tuple[int, ...]:
+        """Compute a one-permutation MinHash signature of the token shingles.
+
+        Each shingle is hashed once and routed to one of ``num_perm`` bins that
+        keeps its minimum, which costs O(shingles) instead of O(shingles * num_perm).
+        Empty bins borrow the value of the next filled bin (densification).
+        """
+        size = self.shingle_size
+        num_bins = self.num_perm
+        signature = [_EMPTY_BIN] * num_bins
+        for i in range(max(len(tokens) - size + 1, 1)):
+            shingle = zlib.crc32(" ".join(tokens[i:i + size]).encode())
+            mixed = (shingle * _MIX_MULTIPLIER) & _MASK_64
+            bin_index = mixed % num_bins
+            value = mixed // num_bins
+            if value < signature[bin_index]:
+                signature[bin_index] = value
+
+        for index in range(num_bins):
+            if signature[index] != _EMPTY_BIN:
+                continue
+            for offset in range(1, num_bins):
+                borrowed = signature[(index + offset) % num_bins]
+                if borrowed != _EMPTY_BIN:
+                    # Offset keeps borrowed bins distinct from the bins they copy
+                    signature[index] = borrowed + offset * _BORROW_OFFSET
+                    break
+        return tuple(signature)
+
+    def _similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Estimate Jaccard similarity from two MinHash signatures."""
+        matches = sum(1 for a, b in zip(first, second) if a == b)
+        return matches / self.num_perm
+
+    @staticmethod
+    def _is_docstring(node: ast.AST) -> bool:
+        return (isinstance(node, ast.Expr)
+                and isinstance(node.value, ast.Constant)
+                and isinstance(node.value.value, str))
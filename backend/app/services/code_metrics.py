@@ -1,9 +1,11 @@
 import ast
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+from .clone_detector import CloneDetector
 
 class CodeMetricsAnalyzer:
     def __init__(self):
         self.metrics = {}
+        self.clone_detector = CloneDetector()
     
     def analyze_function(self, node: ast.FunctionDef) -> Dict:
         """Analyze a single function/method for various metrics."""
@@ -106,4 +108,19 @@ class CodeMetricsAnalyzer:
             
             return max_depth
         
-        return _get_depth(node, 0)
\ No newline at end of file
+        return _get_depth(node, 0)
+
+    def register_function(self, function_id: str, node: ast.FunctionDef) -> Optional[Tuple[str, Tuple[int, ...]]]:
+        """Record a function so it can be checked for copy-pasted duplicates."""
+        fingerprint = self.clone_detector.fingerprint(node)
+        if fingerprint is not None:
+            self.clone_detector.add_fingerprint(function_id, *fingerprint)
+        return fingerprint
+
+    def register_fingerprint(self, function_id: str, digest: str, signature: Tuple[int, ...]):
+        """Record a function fingerprinted elsewhere, such as in a worker process."""
+        self.clone_detector.add_fingerprint(function_id, digest, signature)
+
+    def detect_duplicates(self) -> Tuple[Dict[str, str], List[Tuple[str, str, float]]]:
+        """Detect duplicated functions among all registered functions."""
+        return self.clone_detector.find_clones()
\ No newline at end of file
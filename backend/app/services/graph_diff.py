@@ -0,0 +1,213 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Set, Tuple
+
+import networkx as nx
+
+# Metadata that only records where a symbol sits in its file; moving code is not a change
+POSITIONAL_KEYS = {'line_number', 'lineno'}
+
+# Edges that don't describe the code itself: containment is the tree, and
+# may_call only lists candidates for impact analysis
+IGNORED_EDGE_TYPES = {'contains', 'may_call'}
+
+
+class GraphIndex:
+    """Qualified IDs and Merkle-style content hashes for one analysis graph.
+
+    Every node gets a qualified ID of the form ``file::name`` from its chain
+    of ``contains`` edges (nodes outside any file keep their own name). Each
+    node's hash covers its type, metadata and outgoing call, import and
+    similarity edges, and its subtree hash also covers the subtree hashes of
+    the nodes it contains, so an unchanged file or class can be skipped as a
+    whole.
+    """
+
+    def __init__(self, graph: nx.DiGraph):
+        self.graph = graph
+        self.node_of: Dict[str, str] = {}
+        self.qid_of: Dict[str, str] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.roots: List[str] = []
+        self.node_hash: Dict[str, str] = {}
+        self.tree_hash: Dict[str, str] = {}
+
+        self._assign_ids()
+        self._hash_nodes()
+
+    @classmethod
+    def for_graph(cls, graph: nx.DiGraph) -> "GraphIndex":
+        """Return the graph's index, building and caching it on first use."""
+        index = graph.graph.get('diff_index')
+        if index is None:
+            index = graph.graph['diff_index'] = cls(graph)
+        return index
+
+    def _parent(self, node: str) -> Optional[str]:
+        parents = [
+            source for source, _, data in self.graph.in_edges(node, data=True)
+            if data.get('type') == 'contains'
+        ]
+        # Symbols with the same name in several files share one node; pick one deterministically
+        return min(parents) if parents else None
+
+    def _assign_ids(self):
+        parent_of = {node: self._parent(node) for node in self.graph.nodes}
+        for node in self.graph.nodes:
+            root, seen = node, {node}
+            while parent_of[root] is not None and parent_of[root] not in seen:
+                root = parent_of[root]
+                seen.add(root)
+            qid = node if root == node else f"{root}::{node}"
+            self.qid_of[node] = qid
+            self.node_of[qid] = node
+
+        for node, parent in parent_of.items():
+            qid = self.qid_of[node]
+            if parent is None:
+                self.roots.append(qid)
+            else:
+                self.children.setdefault(self.qid_of[parent], []).append(qid)
+
+    def _hash_nodes(self):
+        for node, data in self.graph.nodes(data=True):
+            qid = self.qid_of[node]
+            payload = {
+                'type': data.get('type', 'default'),
+                'metadata': self.metadata(qid),
+                'edges': sorted(self.edges(qid))
+            }
+            self.node_hash[qid] = _digest(payload)
+
+        # Post-order without recursion so deep or odd containment chains are safe
+        for root in self.roots:
+            stack = [(root, False)]
+            while stack:
+                qid, expanded = stack.pop()
+                if qid in self.tree_hash:
+                    continue
+                if not expanded:
+                    stack.append((qid, True))
+                    stack.extend((child, False) for child in self.children.get(qid, [])
+                                 if child not in self.tree_hash)
+                    continue
+                child_hashes = sorted(self.tree_hash.get(child, '') for child in self.children.get(qid, []))
+                self.tree_hash[qid] = _digest([self.node_hash[qid], child_hashes])
+
+    def metadata(self, qid: str) -> Dict:
+        metadata = self.graph.nodes[self.node_of[qid]].get('metadata', {})
+        return {key: value for key, value in metadata.items() if key not in POSITIONAL_KEYS}
+
+    def edges(self, qid: str) -> Set[Tuple[str, str, str]]:
+        """Outgoing call, import and similarity edges as (source, target, type) qualified triples."""
+        return {
+            (qid, self.qid_of[target], data.get('type', 'default'))
+            for _, target, data in self.graph.out_edges(self.node_of[qid], data=True)
+            if data.get('type') not in IGNORED_EDGE_TYPES
+        }
+
+    def subtree(self, qid: str) -> List[str]:
+        """Return a node and everything it contains."""
+        result, stack, seen = [], [qid], {qid}
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            for child in self.children.get(current, []):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return result
+
+
+def _digest(payload) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def diff_graphs(base: nx.DiGraph, head: nx.DiGraph) -> Dict:
+    """Compute a compact change set between two analysis graphs.
+
+    Work is proportional to the changed subtrees: matching subtrees with equal
+    hashes are never visited.
+    """
+    old, new = GraphIndex.for_graph(base), GraphIndex.for_graph(head)
+    added, removed, modified = [], [], []
+    edges_added, edges_removed = set(), set()
+    became_dead, no_longer_dead = [], []
+
+    def node_summary(index: GraphIndex, qid: str) -> Dict:
+        data = index.graph.nodes[index.node_of[qid]]
+        return {'id': qid, 'type': data.get('type', 'default')}
+
+    def add_subtree(qid: str):
+        for current in new.subtree(qid):
+            if current in old.node_hash:
+                continue
+            added.append(node_summary(new, current))
+            edges_added.update(new.edges(current))
+            if new.metadata(current).get('is_dead_code'):
+                became_dead.append(current)
+
+    def remove_subtree(qid: str):
+        for current in old.subtree(qid):
+            if current in new.node_hash:
+                continue
+            removed.append(node_summary(old, current))
+            edges_removed.update(old.edges(current))
+
+    def compare(qid: str):
+        if old.node_hash[qid] != new.node_hash[qid]:
+            before, after = old.metadata(qid), new.metadata(qid)
+            changes = {
+                key: [before.get(key), after.get(key)]
+                for key in before.keys() | after.keys()
+                if before.get(key) != after.get(key)
+            }
+            entry = {**node_summary(new, qid), 'changes': changes}
+            if isinstance(before.get('complexity'), int) and isinstance(after.get('complexity'), int):
+                entry['complexity_delta'] = after['complexity'] - before['complexity']
+            modified.append(entry)
+
+            old_edges, new_edges = old.edges(qid), new.edges(qid)
+            edges_added.update(new_edges - old_edges)
+            edges_removed.update(old_edges - new_edges)
+
+            if after.get('is_dead_code') and not before.get('is_dead_code'):
+                became_dead.append(qid)
+            elif before.get('is_dead_code') and not after.get('is_dead_code'):
+                no_longer_dead.append(qid)
+
+        match_children(old.children.get(qid, []), new.children.get(qid, []))
+
+    def match_children(old_children: List[str], new_children: List[str]):
+        old_set = set(old_children)
+        for qid in new_children:
+            if qid not in old_set:
+                add_subtree(qid)
+            elif old.tree_hash[qid] != new.tree_hash[qid]:
+                compare(qid)
+        new_set = set(new_children)
+        for qid in old_children:
+            if qid not in new_set:
+                remove_subtree(qid)
+
+    match_children(old.roots, new.roots)
+
+    return {
+        'added': added,
+        'removed': removed,
+        'modified': modified,
+        'edges_added': sorted(edges_added),
+        'edges_removed': sorted(edges_removed),
+        'became_dead': sorted(became_dead),
+        'no_longer_dead': sorted(no_longer_dead),
+        'summary': {
+            'added': len(added),
+            'removed': len(removed),
+            'modified': len(modified),
+            'edges_added': len(edges_added),
+            'edges_removed': len(edges_removed),
+            'became_dead': len(became_dead),
+            'no_longer_dead': len(no_longer_dead)
+        }
+    }
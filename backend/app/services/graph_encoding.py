@@ -0,0 +1,398 @@
+import gzip
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, the other formats are always available
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+COLUMNAR_MEDIA_TYPE = "application/vnd.codeflow.columnar+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+BINARY_MEDIA_TYPE = "application/vnd.codeflow.graph"
+
+BINARY_MAGIC = b"CFG2"
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+
+def graph_to_dict(graph: nx.DiGraph) -> Dict:
+    """Convert a graph to the verbose node/edge list response format."""
+    return {
+        "nodes": [
+            {
+                "id": node,
+                "label": node,
+                "type": data.get("type", "default"),
+                "metadata": data.get("metadata", {})
+            }
+            for node, data in graph.nodes(data=True)
+        ],
+        "edges": [
+            {
+                "source": source,
+                "target": target,
+                "type": data.get("type", "default")
+            }
+            for source, target, data in graph.edges(data=True)
+        ]
+    }
+
+
+def graph_to_columns(graph: nx.DiGraph) -> Dict:
+    """Convert a graph to a columnar layout with a shared string table.
+
+    The first ``node_count`` strings are the node ids in node order, so nodes
+    and edge endpoints are referenced by integer index. Labels are omitted
+    since they always equal the id, and metadata keys are stored once per column
+    with null for nodes that lack the key (a stored None also becomes null).
+    """
+    strings: List[str] = []
+    index: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(strings)
+            strings.append(value)
+        return position
+
+    nodes = list(graph.nodes(data=True))
+    for node, _ in nodes:
+        intern(node)
+
+    node_types = [intern(data.get("type", "default")) for _, data in nodes]
+
+    metadata: Dict[str, List] = {}
+    for position, (_, data) in enumerate(nodes):
+        for key, value in data.get("metadata", {}).items():
+            column = metadata.get(key)
+            if column is None:
+                column = metadata[key] = [None] * len(nodes)
+            column[position] = value
+
+    sources, targets, edge_types = [], [], []
+    for source, target, data in graph.edges(data=True):
+        sources.append(index[source])
+        targets.append(index[target])
+        edge_types.append(intern(data.get("type", "default")))
+
+    return {
+        "version": 1,
+        "strings": strings,
+        "node_count": len(nodes),
+        "edge_count": len(sources),
+        "nodes": {"type": node_types, "metadata": metadata},
+        "edges": {"source": sources, "target": targets, "type": edge_types}
+    }
+
+
+def columns_to_dict(columns: Dict) -> Dict:
+    """Expand a columnar or decoded binary payload back into the verbose response format."""
+    strings = columns["strings"]
+    node_types = columns["nodes"]["type"]
+    metadata_columns = [
+        (key, _column_reader(column, strings))
+        for key, column in columns["nodes"]["metadata"].items()
+    ]
+    nodes = []
+    for position in range(columns["node_count"]):
+        metadata = {}
+        for key, read in metadata_columns:
+            value = read(position)
+            if value is not None:
+                metadata[key] = value
+        nodes.append({
+            "id": strings[position],
+            "label": strings[position],
+            "type": strings[node_types[position]],
+            "metadata": metadata
+        })
+
+    edges = columns["edges"]
+    return {
+        "nodes": nodes,
+        "edges": [
+            {"source": strings[source], "target": strings[target], "type": strings[edge_type]}
+            for source, target, edge_type in zip(edges["source"], edges["target"], edges["type"])
+        ]
+    }
+
+
+# Typed metadata column kinds of the binary layout -> array typecode
+_TYPED_KINDS = {"int32": "i", "float64": "d", "bool": "B", "string": "I"}
+_MISSING_INT32 = -2 ** 31
+_MISSING_BOOL = 2
+_MISSING_STRING = 0xFFFFFFFF
+# Larger integers would lose precision as float64
+_FLOAT_INT_LIMIT = 2 ** 53
+
+
+def _column_kind(values: List) -> str:
+    """Pick the most compact binary kind that can hold every value of a metadata column."""
+    present = [value for value in values if value is not None]
+    if not present:
+        return "json"
+    if all(isinstance(value, bool) for value in present):
+        return "bool"
+    if any(isinstance(value, bool) for value in present):
+        return "json"
+    if all(isinstance(value, int) for value in present):
+        if all(_MISSING_INT32 < value < 2 ** 31 for value in present):
+            return "int32"
+        if all(abs(value) <= _FLOAT_INT_LIMIT for value in present):
+            return "float64"
+        return "json"
+    if all(isinstance(value, (int, float)) for value in present):
+        if all(abs(value) <= _FLOAT_INT_LIMIT for value in present if isinstance(value, int)):
+            return "float64"
+        return "json"
+    if all(isinstance(value, str) for value in present):
+        return "string"
+    if all(isinstance(value, list) and all(isinstance(item, str) for item in value) for value in present):
+        return "string_list"
+    return "json"
+
+
+def _column_reader(column, strings: List[str]):
+    """Return position -> value (None when missing) for any metadata column representation."""
+    if isinstance(column, list):
+        return column.__getitem__
+
+    kind, values = column["kind"], column["values"]
+    if kind == "json":
+        return values.__getitem__
+    if kind == "int32":
+        return lambda position: None if values[position] == _MISSING_INT32 else values[position]
+    if kind == "float64":
+        return lambda position: None if values[position] != values[position] else values[position]
+    if kind == "bool":
+        return lambda position: None if values[position] == _MISSING_BOOL else bool(values[position])
+    if kind == "string":
+        return lambda position: None if values[position] == _MISSING_STRING else strings[values[position]]
+    offsets, present = column["offsets"], column["present"]
+    return lambda position: (
+        [strings[index] for index in values[offsets[position]:offsets[position + 1]]]
+        if present[position] else None
+    )
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column.tobytes()
+
+
+def encode_binary(columns: Dict) -> bytes:
+    """Pack a columnar payload into a typed-array friendly binary layout.
+
+    Layout: ``CFG2`` magic, uint32 header length, JSON header padded so the
+    data that follows starts on an 8-byte boundary, then little-endian arrays,
+    each padded to 8 bytes: uint32 node_type[n], edge_source[m],
+    edge_target[m], edge_type[m], and the typed metadata columns in header
+    order. Metadata columns are stored by kind so a browser can wrap them with
+    typed arrays without copying:
+
+    - ``int32``: Int32Array, -2**31 where missing
+    - ``float64``: Float64Array, NaN where missing
+    - ``bool``: Uint8Array of 0/1, 2 where missing
+    - ``string``: Uint32Array of string table indexes, 0xFFFFFFFF where missing
+    - ``string_list``: Uint8Array present[n] (0 where missing), Uint32Array
+      offsets[n + 1] into a Uint32Array of string table indexes
+    - ``json``: anything else, kept as a list in the header
+    """
+    strings = list(columns["strings"])
+    index = {value: position for position, value in enumerate(strings)}
+
+    def intern(value: str) -> int:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(strings)
+            strings.append(value)
+        return position
+
+    described, arrays = [], []
+    for key, values in columns["nodes"]["metadata"].items():
+        kind = _column_kind(values)
+        description = {"key": key, "kind": kind}
+        if kind == "json":
+            description["values"] = values
+        elif kind == "int32":
+            arrays.append(array("i", (_MISSING_INT32 if value is None else value for value in values)))
+        elif kind == "float64":
+            arrays.append(array("d", (float("nan") if value is None else value for value in values)))
+        elif kind == "bool":
+            arrays.append(array("B", (_MISSING_BOOL if value is None else int(value) for value in values)))
+        elif kind == "string":
+            arrays.append(array("I", (_MISSING_STRING if value is None else intern(value) for value in values)))
+        else:
+            offsets, items, present = array("I", [0]), array("I"), array("B")
+            for value in values:
+                items.extend(intern(item) for item in value or ())
+                offsets.append(len(items))
+                present.append(value is not None)
+            description["length"] = len(items)
+            arrays.extend([present, offsets, items])
+        described.append(description)
+
+    header = json.dumps({
+        "version": 2,
+        "strings": strings,
+        "node_count": columns["node_count"],
+        "edge_count": columns["edge_count"],
+        "metadata": described
+    }, separators=(",", ":")).encode()
+    header += b" " * (-(8 + len(header)) % 8)
+
+    parts = [BINARY_MAGIC, struct.pack("<I", len(header)), header]
+    for column in [array("I", columns["nodes"]["type"]), array("I", columns["edges"]["source"]),
+                   array("I", columns["edges"]["target"]), array("I", columns["edges"]["type"])] + arrays:
+        data = _little_endian(column)
+        parts.append(data + b"\0" * (-len(data) % 8))
+    return b"".join(parts)
+
+
+def decode_binary(body: bytes) -> Dict:
+    """Read a binary payload back into the columnar layout without copying the arrays.
+
+    Typed metadata columns are returned as ``{"kind", "values"[, "offsets", "present"]}``
+    with memoryview values; ``columns_to_dict`` expands them.
+    """
+    if body[:4] != BINARY_MAGIC:
+        raise ValueError("Not a CodeFlow binary graph payload")
+    (header_length,) = struct.unpack_from("<I", body, 4)
+    offset = 8 + header_length
+    header = json.loads(body[8:offset])
+
+    view = memoryview(body)
+    node_count, edge_count = header["node_count"], header["edge_count"]
+
+    def read_column(typecode: str, count: int):
+        nonlocal offset
+        size = array(typecode).itemsize * count
+        column = view[offset:offset + size].cast(typecode)
+        offset += size + (-size % 8)
+        if sys.byteorder != "little":
+            column = array(typecode, column)
+            column.byteswap()
+        return column
+
+    node_types = read_column("I", node_count)
+    sources = read_column("I", edge_count)
+    targets = read_column("I", edge_count)
+    edge_types = read_column("I", edge_count)
+
+    metadata = {}
+    for description in header["metadata"]:
+        kind = description["kind"]
+        if kind == "json":
+            column = {"kind": kind, "values": description["values"]}
+        elif kind == "string_list":
+            present = read_column("B", node_count)
+            offsets = read_column("I", node_count + 1)
+            column = {"kind": kind, "present": present, "offsets": offsets,
+                      "values": read_column("I", description["length"])}
+        else:
+            column = {"kind": kind, "values": read_column(_TYPED_KINDS[kind], node_count)}
+        metadata[description["key"]] = column
+
+    return {
+        "version": header["version"],
+        "strings": header["strings"],
+        "node_count": node_count,
+        "edge_count": edge_count,
+        "nodes": {"type": node_types, "metadata": metadata},
+        "edges": {"source": sources, "target": targets, "type": edge_types}
+    }
+
+
+def available_media_types() -> List[str]:
+    """Media types the server can produce, in order of preference."""
+    media_types = [BINARY_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE, JSON_MEDIA_TYPE]
+    if msgpack is not None:
+        media_types.insert(1, MSGPACK_MEDIA_TYPE)
+    return media_types
+
+
+def available_encodings() -> List[str]:
+    """Content encodings the server can produce, in order of preference."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _parse_quality_list(header: Optional[str]) -> Dict[str, float]:
+    """Parse an Accept-style header into {value: q}."""
+    qualities = {}
+    for item in (header or "").split(","):
+        parts = [part.strip() for part in item.split(";")]
+        if not parts[0]:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        qualities[parts[0].lower()] = quality
+    return qualities
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """Pick the response format from an Accept header, defaulting to JSON."""
+    qualities = _parse_quality_list(accept)
+    best, best_quality = JSON_MEDIA_TYPE, 0.0
+    for media_type in available_media_types():
+        quality = qualities.get(media_type, 0.0)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    # Wildcards and unknown types fall back to plain JSON for compatibility
+    return best
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick a content encoding from an Accept-Encoding header."""
+    qualities = _parse_quality_list(accept_encoding)
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def encode_graph(graph: nx.DiGraph, media_type: str) -> bytes:
+    """Serialize a graph in the requested format."""
+    if media_type == JSON_MEDIA_TYPE:
+        return json.dumps(graph_to_dict(graph)).encode()
+
+    columns = graph_to_columns(graph)
+    if media_type == BINARY_MEDIA_TYPE:
+        return encode_binary(columns)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(columns)
+    if media_type == COLUMNAR_MEDIA_TYPE:
+        return json.dumps(columns, separators=(",", ":")).encode()
+    raise ValueError(f"Unsupported media type: {media_type}")
+
+
+def compress(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress a body, returning it with the encoding actually applied."""
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if encoding == "br":
+        return brotli.compress(body, quality=5), "br"
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6), "gzip"
+    raise ValueError(f"Unsupported encoding: {encoding}")
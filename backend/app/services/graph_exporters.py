@@ -0,0 +1,213 @@
+"""Streaming GraphML, DOT and GEXF writers for analysis graphs.
+
+Each exporter is a generator of text chunks, so a graph is written out
+incrementally instead of being assembled as a document in memory. Node and
+edge metadata is flattened into scalar attributes that Gephi and Graphviz
+understand. Nothing here imports matplotlib.
+"""
+import re
+from typing import Callable, Dict, Iterator, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+import networkx as nx
+
+# Number of nodes or edges rendered per yielded chunk
+CHUNK_SIZE = 1000
+
+# Control characters that are not allowed anywhere in an XML 1.0 document
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def flatten_attributes(data: Dict) -> Dict:
+    """Flatten node or edge data into scalar attributes."""
+    flat = {}
+    for key, value in data.items():
+        if key == 'metadata' and isinstance(value, dict):
+            for meta_key, meta_value in value.items():
+                flat[meta_key] = _scalar(meta_value)
+        else:
+            flat[key] = _scalar(value)
+    return {key: value for key, value in flat.items() if value is not None}
+
+
+def _scalar(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple, set)):
+        return "; ".join(str(item) for item in value)
+    return str(value)
+
+
+def _attribute_types(items) -> Dict[str, str]:
+    """Infer one of boolean/int/double/string per attribute key in a single pass."""
+    types: Dict[str, str] = {}
+    for data in items:
+        for key, value in flatten_attributes(data).items():
+            if isinstance(value, bool):
+                kind = 'boolean'
+            elif isinstance(value, int):
+                kind = 'int'
+            elif isinstance(value, float):
+                kind = 'double'
+            else:
+                kind = 'string'
+            current = types.get(key)
+            if current is None:
+                types[key] = kind
+            elif current != kind:
+                # Mixed ints and floats widen to double, anything else falls back to string
+                types[key] = 'double' if {current, kind} <= {'int', 'double'} else 'string'
+    return types
+
+
+def _format_value(value, kind: str = 'string') -> str:
+    if kind == 'boolean' or isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _xml_text(value) -> str:
+    return escape(_INVALID_XML_CHARS.sub('', str(value)))
+
+
+def _xml_attr(value) -> str:
+    return quoteattr(_INVALID_XML_CHARS.sub('', str(value)))
+
+
+def _chunked(lines: Iterator[str]) -> Iterator[str]:
+    batch: List[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= CHUNK_SIZE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def iter_graphml(graph: nx.DiGraph) -> Iterator[str]:
+    """Stream a graph as GraphML."""
+    node_types = _attribute_types(data for _, data in graph.nodes(data=True))
+    edge_types = _attribute_types(data for _, _, data in graph.edges(data=True))
+    node_keys = {key: f"n_{index}" for index, key in enumerate(node_types)}
+    edge_keys = {key: f"e_{index}" for index, key in enumerate(edge_types)}
+
+    header = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+        'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+    ]
+    for key, kind in node_types.items():
+        header.append(f'  <key id="{node_keys[key]}" for="node" attr.name={_xml_attr(key)} attr.type="{kind}"/>\n')
+    for key, kind in edge_types.items():
+        header.append(f'  <key id="{edge_keys[key]}" for="edge" attr.name={_xml_attr(key)} attr.type="{kind}"/>\n')
+    header.append('  <graph edgedefault="directed">\n')
+    yield "".join(header)
+
+    def data_elements(data: Dict, keys: Dict[str, str], types: Dict[str, str]) -> str:
+        return "".join(
+            f'<data key="{keys[key]}">{_xml_text(_format_value(value, types[key]))}</data>'
+            for key, value in flatten_attributes(data).items()
+        )
+
+    def node_lines():
+        for node, data in graph.nodes(data=True):
+            yield f'    <node id={_xml_attr(node)}>{data_elements(data, node_keys, node_types)}</node>\n'
+
+    def edge_lines():
+        for source, target, data in graph.edges(data=True):
+            yield (f'    <edge source={_xml_attr(source)} target={_xml_attr(target)}>'
+                   f'{data_elements(data, edge_keys, edge_types)}</edge>\n')
+
+    yield from _chunked(node_lines())
+    yield from _chunked(edge_lines())
+    yield '  </graph>\n</graphml>\n'
+
+
+def _dot_quote(value) -> str:
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{text}"'
+
+
+def iter_dot(graph: nx.DiGraph) -> Iterator[str]:
+    """Stream a graph in Graphviz DOT format."""
+    yield 'digraph codeflow {\n  node [shape=box];\n'
+
+    def attribute_list(data: Dict, label: str = None) -> str:
+        attributes = flatten_attributes(data)
+        if label is not None:
+            attributes = {'label': label, **attributes}
+        if not attributes:
+            return ""
+        return " [" + ", ".join(f"{_dot_quote(key)}={_dot_quote(_format_value(value))}" for key, value in attributes.items()) + "]"
+
+    def node_lines():
+        for node, data in graph.nodes(data=True):
+            label = str(node).split("::")[-1]
+            yield f"  {_dot_quote(node)}{attribute_list(data, label)};\n"
+
+    def edge_lines():
+        for source, target, data in graph.edges(data=True):
+            yield f"  {_dot_quote(source)} -> {_dot_quote(target)}{attribute_list(data)};\n"
+
+    yield from _chunked(node_lines())
+    yield from _chunked(edge_lines())
+    yield "}\n"
+
+
+_GEXF_TYPES = {'boolean': 'boolean', 'int': 'long', 'double': 'double', 'string': 'string'}
+
+
+def iter_gexf(graph: nx.DiGraph) -> Iterator[str]:
+    """Stream a graph as GEXF 1.2 for Gephi."""
+    node_types = _attribute_types(data for _, data in graph.nodes(data=True))
+    edge_types = _attribute_types(data for _, _, data in graph.edges(data=True))
+    node_ids = {key: str(index) for index, key in enumerate(node_types)}
+    edge_ids = {key: str(index) for index, key in enumerate(edge_types)}
+
+    header = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<gexf xmlns="http://www.gexf.net/1.2draft" version="1.2">\n',
+        '  <graph mode="static" defaultedgetype="directed">\n',
+        '    <attributes class="node">\n'
+    ]
+    for key, kind in node_types.items():
+        header.append(f'      <attribute id="{node_ids[key]}" title={_xml_attr(key)} type="{_GEXF_TYPES[kind]}"/>\n')
+    header.append('    </attributes>\n    <attributes class="edge">\n')
+    for key, kind in edge_types.items():
+        header.append(f'      <attribute id="{edge_ids[key]}" title={_xml_attr(key)} type="{_GEXF_TYPES[kind]}"/>\n')
+    header.append('    </attributes>\n    <nodes>\n')
+    yield "".join(header)
+
+    def attvalues(data: Dict, ids: Dict[str, str], types: Dict[str, str]) -> str:
+        values = "".join(
+            f'<attvalue for="{ids[key]}" value={_xml_attr(_format_value(value, types[key]))}/>'
+            for key, value in flatten_attributes(data).items()
+        )
+        return f"<attvalues>{values}</attvalues>" if values else ""
+
+    def node_lines():
+        for node, data in graph.nodes(data=True):
+            label = str(node).split("::")[-1]
+            yield (f'      <node id={_xml_attr(node)} label={_xml_attr(label)}>'
+                   f'{attvalues(data, node_ids, node_types)}</node>\n')
+
+    def edge_lines():
+        for index, (source, target, data) in enumerate(graph.edges(data=True)):
+            yield (f'      <edge id="{index}" source={_xml_attr(source)} target={_xml_attr(target)}>'
+                   f'{attvalues(data, edge_ids, edge_types)}</edge>\n')
+
+    yield from _chunked(node_lines())
+    yield '    </nodes>\n    <edges>\n'
+    yield from _chunked(edge_lines())
+    yield '    </edges>\n  </graph>\n</gexf>\n'
+
+
+# format -> (writer, media type)
+EXPORTERS: Dict[str, Tuple[Callable[[nx.DiGraph], Iterator[str]], str]] = {
+    'graphml': (iter_graphml, 'application/graphml+xml'),
+    'dot': (iter_dot, 'text/vnd.graphviz'),
+    'gexf': (iter_gexf, 'application/gexf+xml'),
+}
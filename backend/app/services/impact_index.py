@@ -0,0 +1,168 @@
+import os
+from typing import Dict, Iterable, List, Set, Tuple
+
+import networkx as nx
+
+TEST = "test"
+ENTRY_POINT = "entry_point"
+
+# Possible calls count too: selecting an extra test is cheap, missing one is not
+CALL_EDGE_TYPES = ('calls', 'may_call')
+
+
+class ImpactIndex:
+    """Precomputed transitive-caller reachability for change-impact queries.
+
+    The call graph is condensed into a DAG of strongly connected components.
+    Tests and entry points (functions nothing else calls) are numbered, and
+    every component stores a bitset of the numbered functions that reach it
+    through calls, built once in topological order. Identical bitsets are
+    shared, so components called by the same tests cost one integer, and each
+    is stored without its low zero bits, so a component reached only by the
+    tests of one module stays small. A query is then an OR over the bitsets
+    of the changed functions.
+    """
+
+    def __init__(self, graph: nx.DiGraph):
+        self.graph = graph
+        call_graph = nx.DiGraph()
+        call_graph.add_nodes_from(
+            node for node, data in graph.nodes(data=True)
+            if data.get('type') in ['function', 'method']
+        )
+        call_graph.add_edges_from(
+            (source, target) for source, target, data in graph.edges(data=True)
+            if data.get('type') in CALL_EDGE_TYPES and source in call_graph and target in call_graph
+        )
+
+        condensed = nx.condensation(call_graph)
+        self.component_of: Dict[str, int] = condensed.graph['mapping']
+
+        # Number every test and entry point next to the code it calls first, in
+        # graph (file) order, so the targets reaching one module get neighbouring bits
+        order = {node: position for position, node in enumerate(call_graph)}
+        found = []
+        for node in call_graph:
+            component = self.component_of[node]
+            if self._is_test(node):
+                kind = TEST
+            elif condensed.in_degree(component) == 0:
+                kind = ENTRY_POINT
+            else:
+                continue
+            home = min((order[callee] for callee in call_graph.successors(node)), default=order[node])
+            found.append((home, order[node], node, kind))
+
+        self.targets: List[str] = []
+        self.target_kinds: List[str] = []
+        own_bits: Dict[int, int] = {}
+        for _, _, node, kind in sorted(found):
+            component = self.component_of[node]
+            own_bits[component] = own_bits.get(component, 0) | (1 << len(self.targets))
+            self.targets.append(node)
+            self.target_kinds.append(kind)
+
+        # Callers come first in topological order, so their bitsets are ready.
+        # Bitsets are stored as (shift, bits >> shift) to drop the low zero bits.
+        shared: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self.reached_by: List[Tuple[int, int]] = [(0, 0)] * len(condensed)
+        for component in nx.topological_sort(condensed):
+            bits = own_bits.get(component, 0)
+            for caller in condensed.predecessors(component):
+                shift, value = self.reached_by[caller]
+                bits |= value << shift
+            shift = (bits & -bits).bit_length() - 1 if bits else 0
+            packed = (shift, bits >> shift)
+            self.reached_by[component] = shared.setdefault(packed, packed)
+        self.distinct_bitsets = len(shared)
+
+    @classmethod
+    def for_graph(cls, graph: nx.DiGraph) -> "ImpactIndex":
+        """Return the graph's index, building and caching it on first use."""
+        index = graph.graph.get('impact_index')
+        if index is None:
+            index = graph.graph['impact_index'] = cls(graph)
+        return index
+
+    def _containing_files(self, node: str) -> Set[str]:
+        files, stack, seen = set(), [node], {node}
+        while stack:
+            current = stack.pop()
+            for parent, _, data in self.graph.in_edges(current, data=True):
+                if data.get('type') != 'contains' or parent in seen:
+                    continue
+                seen.add(parent)
+                if self.graph.nodes[parent].get('type') == 'file':
+                    files.add(parent)
+                stack.append(parent)
+        return files
+
+    def _is_test(self, node: str) -> bool:
+        """pytest-style detection: a ``test*`` function, or a ``test*`` method of a
+        ``Test*`` class, defined in a ``test_*.py`` or ``*_test.py`` file."""
+        parts = node.split('.')
+        if not parts[-1].startswith('test'):
+            return False
+        if len(parts) > 1 and not parts[0].startswith('Test'):
+            return False
+        return any(
+            name.startswith('test_') or name.endswith('_test.py')
+            for name in self._containing_files(node)
+        )
+
+    def _functions_under(self, node: str) -> Set[str]:
+        """Return the functions and methods a file, class or function node stands for."""
+        found, stack, seen = set(), [node], {node}
+        while stack:
+            current = stack.pop()
+            if current in self.component_of:
+                found.add(current)
+            for _, child, data in self.graph.out_edges(current, data=True):
+                if data.get('type') == 'contains' and child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return found
+
+    def query(self, files: Iterable[str] = (), symbols: Iterable[str] = ()) -> Dict:
+        """Return the tests and entry points affected by changed files or symbols.
+
+        Files are matched by base name, as file nodes are named. Symbols may be
+        plain node IDs (``Class.method``) or qualified ``file::name`` IDs.
+        """
+        changed: Set[str] = set()
+        unknown = []
+        for path in files:
+            name = os.path.basename(path)
+            if self.graph.nodes.get(name, {}).get('type') == 'file':
+                changed |= self._functions_under(name)
+            else:
+                unknown.append(path)
+        for symbol in symbols:
+            name = symbol.split('::')[-1]
+            if name in self.graph:
+                changed |= self._functions_under(name)
+            else:
+                unknown.append(symbol)
+
+        bits = 0
+        for node in changed:
+            shift, value = self.reached_by[self.component_of[node]]
+            bits |= value << shift
+
+        tests, entry_points = [], []
+        # Scan the binary digits least significant first to find the set bits
+        digits = bin(bits)[:1:-1]
+        position = digits.find('1')
+        while position != -1:
+            if self.target_kinds[position] == TEST:
+                tests.append(self.targets[position])
+            else:
+                entry_points.append(self.targets[position])
+            position = digits.find('1', position + 1)
+
+        return {
+            'changed': sorted(changed),
+            'tests': sorted(tests),
+            'entry_points': sorted(entry_points),
+            'unknown': unknown
+        }
@@ -0,0 +1,170 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+import networkx as nx
+
+from .graph_diff import GraphIndex
+from .impact_index import ImpactIndex
+from .project_analyzer import ProjectAnalyzer
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a running analysis to abort it."""
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting or running."""
+
+
+class AnalysisJob:
+    def __init__(self, job_id: str, work_dir: str, archive_path: str):
+        self.id = job_id
+        self.work_dir = work_dir
+        self.archive_path = archive_path
+        self.status = QUEUED
+        self.phase = "queued"
+        self.files_done = 0
+        self.files_total = 0
+        self.error: Optional[str] = None
+        self.result: Optional[nx.DiGraph] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = threading.Event()
+        self.future: Optional[Future] = None
+        # Bumped on every change so event streams know when to send an update
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def update(self, **changes):
+        with self._lock:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self.version += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'phase': self.phase,
+                'files_done': self.files_done,
+                'files_total': self.files_total,
+                'error': self.error,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at
+            }
+
+
+class JobManager:
+    """Runs project analyses in background threads with bounded concurrency.
+
+    Finished jobs keep their result for ``result_ttl`` seconds and are then
+    dropped; working directories are removed as soon as a job stops running.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_pending: int = 16, result_ttl: float = 3600):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="analysis-job")
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._lock = threading.Lock()
+
+    def create_work_dir(self) -> str:
+        """Create the temporary directory a new job's upload is written to."""
+        return tempfile.mkdtemp(prefix="codeflow-job-")
+
+    def check_capacity(self):
+        """Raise JobQueueFull if no new job would be accepted right now."""
+        self.expire()
+        with self._lock:
+            self._check_capacity()
+
+    def _check_capacity(self):
+        active = sum(1 for job in self._jobs.values() if job.status not in FINISHED_STATES)
+        if active >= self.max_pending:
+            raise JobQueueFull(f"Too many analysis jobs in progress (limit {self.max_pending})")
+
+    def submit(self, work_dir: str, archive_path: str) -> AnalysisJob:
+        """Queue an uploaded archive for analysis."""
+        self.expire()
+        with self._lock:
+            self._check_capacity()
+            job = AnalysisJob(uuid.uuid4().hex, work_dir, archive_path)
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        self.expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[AnalysisJob]:
+        """Cancel a queued or running job; finished jobs are left untouched."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return job
+        job.cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            # Never started, so the worker won't clean up after it
+            self._finish(job, CANCELLED)
+        return job
+
+    def expire(self):
+        """Forget finished jobs whose retention period has passed."""
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and now - job.finished_at > self.result_ttl
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def _run(self, job: AnalysisJob):
+        def progress(phase: str, done: int, total: int):
+            if job.cancel_requested.is_set():
+                raise JobCancelled()
+            if phase == 'parsing':
+                job.update(phase=phase, files_done=done, files_total=total)
+            else:
+                job.update(phase=phase)
+
+        try:
+            job.update(status=RUNNING, phase="extracting")
+            project_dir = os.path.join(job.work_dir, "project")
+            with zipfile.ZipFile(job.archive_path, 'r') as zip_ref:
+                zip_ref.extractall(project_dir)
+            progress("extracting", 0, 0)
+
+            graph = ProjectAnalyzer().analyze_project(project_dir, progress=progress)
+            # Built once here so diff and impact queries never pay for them on the event loop
+            progress("indexing", 0, 0)
+            GraphIndex.for_graph(graph)
+            ImpactIndex.for_graph(graph)
+            self._finish(job, COMPLETED, result=graph)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            print(f"Error in analysis job {job.id}: {str(e)}")
+            self._finish(job, FAILED, error=str(e))
+
+    def _finish(self, job: AnalysisJob, status: str, result: Optional[nx.DiGraph] = None,
+                error: Optional[str] = None):
+        shutil.rmtree(job.work_dir, ignore_errors=True)
+        job.update(status=status, phase=status, result=result, error=error, finished_at=time.time())
@@ -1,10 +1,50 @@
 import os
 import ast
+import fnmatch
+import sys
 import networkx as nx
-from typing import Dict, List, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from pathlib import Path
+from .analysis_cache import AnalysisCache
 from .code_metrics import CodeMetricsAnalyzer
 
+DEFAULT_INCLUDE = ['*.py']
+
+# Called with (phase, done, total) as analysis advances
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def _matches(path: str, patterns: List[str]) -> bool:
+    """Check a relative path (or its base name) against glob patterns."""
+    name = path.rsplit('/', 1)[-1]
+    return any(fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def _analyze_file_task(task: Tuple[str, Optional[str]]) -> Dict:
+    """Analyze one file in isolation, going through the persistent cache when given."""
+    file_path, cache_dir = task
+    cache = AnalysisCache(cache_dir) if cache_dir else None
+    key = None
+    if cache:
+        try:
+            with open(file_path, 'rb') as f:
+                key = cache.make_key(os.path.basename(file_path), f.read())
+        except OSError:
+            key = None
+        if key:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+    analyzer = ProjectAnalyzer()
+    analyzer._analyze_file(file_path)
+    result = analyzer.get_file_result()
+    if key:
+        cache.put(key, result)
+    return result
+
+
 class ProjectAnalyzer:
     def __init__(self):
         self.graph = nx.DiGraph()
@@ -12,18 +52,85 @@ class ProjectAnalyzer:
         self.imports = {}
         self.dead_code = set()
         self.metrics_analyzer = CodeMetricsAnalyzer() 
+        self.fingerprints = []  # (function_id, digest, signature) for per-file results
+        self.calls = []  # (caller_id, [[kind, receiver, name]]) resolved once all files are merged
 
-    def analyze_project(self, project_path: str) -> nx.DiGraph:
+    def analyze_project(self, project_path: str, include: Optional[List[str]] = None,
+                        exclude: Optional[List[str]] = None, workers: int = 1,
+                        cache_dir: Optional[str] = None,
+                        progress: Optional[ProgressCallback] = None) -> nx.DiGraph:
         """Analyze entire project directory."""
-        for root, _, files in os.walk(project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    self._analyze_file(file_path)
+        progress = progress or (lambda phase, done, total: None)
+
+        progress('collecting', 0, 0)
+        files = self.collect_files(project_path, include, exclude)
+        self.analyze_files(files, workers=workers, cache_dir=cache_dir, progress=progress)
         
+        progress('calls', len(files), len(files))
+        self._analyze_calls()
+        progress('dead_code', len(files), len(files))
         self._analyze_dead_code()
+        progress('duplicates', len(files), len(files))
+        self._analyze_duplicates()
         return self.graph
 
+    @staticmethod
+    def collect_files(project_path: str, include: Optional[List[str]] = None,
+                      exclude: Optional[List[str]] = None) -> List[str]:
+        """List files under a directory matching the include globs and none of the exclude globs."""
+        include = include or DEFAULT_INCLUDE
+        exclude = exclude or []
+        files = []
+        for root, dirs, names in os.walk(project_path):
+            rel_root = os.path.relpath(root, project_path).replace(os.sep, '/')
+            rel_root = '' if rel_root == '.' else f"{rel_root}/"
+            # Prune excluded directories instead of walking into them
+            dirs[:] = sorted(d for d in dirs if not _matches(rel_root + d, exclude))
+            for name in sorted(names):
+                rel_path = rel_root + name
+                if _matches(rel_path, include) and not _matches(rel_path, exclude):
+                    files.append(os.path.join(root, name))
+        return files
+
+    def analyze_files(self, file_paths: List[str], workers: int = 1, cache_dir: Optional[str] = None,
+                      progress: Optional[ProgressCallback] = None):
+        """Analyze files, in worker processes when workers > 1, and merge them in order."""
+        progress = progress or (lambda phase, done, total: None)
+        tasks = [(file_path, cache_dir) for file_path in file_paths]
+        progress('parsing', 0, len(tasks))
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(tasks) // (workers * 8))
+                results = executor.map(_analyze_file_task, tasks, chunksize=chunksize)
+                for done, result in enumerate(results, 1):
+                    self._merge_file_result(result)
+                    progress('parsing', done, len(tasks))
+        else:
+            for done, task in enumerate(tasks, 1):
+                self._merge_file_result(_analyze_file_task(task))
+                progress('parsing', done, len(tasks))
+
+    def get_file_result(self) -> Dict:
+        """Export this analyzer's graph and fingerprints in a JSON-serializable form."""
+        return {
+            'nodes': [[node, data] for node, data in self.graph.nodes(data=True)],
+            'edges': [[source, target, data] for source, target, data in self.graph.edges(data=True)],
+            'imports': {file_name: sorted(modules) for file_name, modules in self.imports.items()},
+            'fingerprints': [[function_id, digest, list(signature)]
+                             for function_id, digest, signature in self.fingerprints],
+            'calls': [[caller, calls] for caller, calls in self.calls]
+        }
+
+    def _merge_file_result(self, result: Dict):
+        """Merge a per-file result into the project graph."""
+        self.graph.add_nodes_from((node, data) for node, data in result['nodes'])
+        self.graph.add_edges_from((source, target, data) for source, target, data in result['edges'])
+        for file_name, modules in result['imports'].items():
+            self.imports.setdefault(file_name, set()).update(modules)
+        for function_id, digest, signature in result['fingerprints']:
+            self.metrics_analyzer.register_fingerprint(function_id, digest, signature)
+        self.calls.extend((caller, calls) for caller, calls in result['calls'])
+
     def _analyze_file(self, file_path: str):
         """Analyze single Python file."""
         try:
@@ -43,7 +150,7 @@ class ProjectAnalyzer:
             self._analyze_imports(tree, file_name)
             self._analyze_functions(tree, file_name)
         except Exception as e:
-            print(f"Error analyzing file {file_path}: {str(e)}")
+            print(f"Error analyzing file {file_path}: {str(e)}", file=sys.stderr)
 
     def _get_file_metrics(self, content: str) -> Dict:
         """Calculate file metrics."""
@@ -78,6 +185,8 @@ class ProjectAnalyzer:
 
     def _analyze_functions(self, tree: ast.AST, file_name: str):
         """Analyze functions and classes in the file."""
+        imported = self._imported_names(tree)
+
         def get_parent_class(node):
             """Helper function to find parent class of a function"""
             for parent in ast.walk(tree):
@@ -113,6 +222,8 @@ class ProjectAnalyzer:
                     if isinstance(item, ast.FunctionDef):
                         metrics = self.metrics_analyzer.analyze_function(item)
                         method_name = f"{class_name}.{item.name}"
+                        self._register_function(method_name, item)
+                        self._collect_calls(method_name, item, class_name, imported)
                         self.graph.add_node(
                             method_name,
                             type="method",
@@ -133,6 +244,8 @@ class ProjectAnalyzer:
                 parent_class = get_parent_class(node)
                 if not parent_class:  # Standalone function
                     metrics = self.metrics_analyzer.analyze_function(node)
+                    self._register_function(node.name, node)
+                    self._collect_calls(node.name, node, imported=imported)
                     self.graph.add_node(
                         node.name,
                         type="function",
@@ -149,53 +262,99 @@ class ProjectAnalyzer:
                         relationship="contains"
                     )
 
-    def _analyze_function_calls(self, node: ast.AST, function_id: str):
-        """Analyze function calls within a function."""
-        current_file = function_id.split('::')[0]
-        
+    def _register_function(self, function_id: str, node: ast.FunctionDef):
+        """Fingerprint a function for duplicate detection."""
+        fingerprint = self.metrics_analyzer.register_function(function_id, node)
+        if fingerprint is not None:
+            self.fingerprints.append((function_id, *fingerprint))
+
+    @staticmethod
+    def _imported_names(tree: ast.AST) -> Set[str]:
+        """Names bound by the file's imports, e.g. ``os`` or ``utils`` in ``from pkg import utils``."""
+        names = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    names.add(alias.asname or alias.name.split('.')[0])
+            elif isinstance(node, ast.ImportFrom):
+                for alias in node.names:
+                    names.add(alias.asname or alias.name)
+        return names
+
+    def _collect_calls(self, function_id: str, node: ast.FunctionDef, class_name: Optional[str] = None,
+                       imported: Set[str] = frozenset()):
+        """Record the calls a function makes; they are resolved once all files are known.
+
+        Each call is stored as ``[kind, receiver, name]``, where kind is
+        ``function`` for ``name()``, ``module`` for ``imported.name()`` and
+        ``method`` for any other ``receiver.name()``. Calls on anything but a
+        bare name (``os.path.join()``, ``{}.get()``, ``f().run()``) are skipped.
+        """
+        calls = []
         for child in ast.walk(node):
-            if isinstance(child, ast.Call):
-                called_func = None
-                
-                if isinstance(child.func, ast.Name):
-                    # Direct function call
-                    base_name = child.func.id
-                    possible_targets = [
-                        f"{current_file}::{base_name}",  # Same file
-                        base_name  # Could be in another file
-                    ]
-                    for target in possible_targets:
-                        if target in self.graph:
-                            called_func = target
-                            break
-                            
-                elif isinstance(child.func, ast.Attribute):
-                    if isinstance(child.func.value, ast.Name):
-                        if child.func.value.id == 'self':
-                            # For self.method() calls
-                            called_func = f"{current_file}::{child.func.attr}"
-                        elif child.func.value.id == 'cls':
-                            # For cls.method() calls (classmethods)
-                            called_func = f"{current_file}::{child.func.attr}"
-                        else:
-                            # Handle class method calls like ClassName.method()
-                            base_name = child.func.attr
-                            possible_targets = [
-                                f"{current_file}::{base_name}",
-                                base_name
-                            ]
-                            for target in possible_targets:
-                                if target in self.graph:
-                                    called_func = target
-                                    break
-                
-                if called_func:
-                    self.graph.add_edge(
-                        function_id,
-                        called_func,
-                        type="calls",
-                        relationship="calls"
-                    )
+            if not isinstance(child, ast.Call):
+                continue
+            if isinstance(child.func, ast.Name):
+                # Direct function call
+                calls.append(['function', None, child.func.id])
+            elif isinstance(child.func, ast.Attribute) and isinstance(child.func.value, ast.Name):
+                receiver = child.func.value.id
+                if class_name and receiver in ('self', 'cls'):
+                    # self.method() / cls.method() calls
+                    calls.append(['method', class_name, child.func.attr])
+                elif receiver in imported:
+                    # module.function() or ImportedClass.method() calls
+                    calls.append(['module', receiver, child.func.attr])
+                else:
+                    # obj.method() calls on a receiver of unknown type
+                    calls.append(['method', receiver, child.func.attr])
+        if calls:
+            self.calls.append((function_id, calls))
+
+    def _analyze_calls(self):
+        """Add call edges between functions and methods across the whole project.
+
+        A call whose target is certain (``name()``, ``self.name()``,
+        ``Class.name()`` or ``module.name()`` naming a defined function) gets a
+        ``calls`` edge. Any other ``obj.name()`` call may reach every method
+        called ``name``; those candidates get ``may_call`` edges, which only
+        impact analysis follows, so they never count as real calls.
+        """
+        function_types = {
+            node: data.get('type') for node, data in self.graph.nodes(data=True)
+            if data.get('type') in ['function', 'method']
+        }
+        methods_by_name: Dict[str, List[str]] = {}
+        for node, node_type in function_types.items():
+            if node_type == 'method':
+                methods_by_name.setdefault(node.rsplit('.', 1)[-1], []).append(node)
+
+        for caller, calls in self.calls:
+            for kind, receiver, name in calls:
+                candidates = []
+                if kind == 'function':
+                    if function_types.get(name) == 'function':
+                        targets = [name]
+                    elif f"{name}.__init__" in function_types:
+                        # Instantiating a project class runs its constructor
+                        targets = [f"{name}.__init__"]
+                    else:
+                        targets = []
+                elif f"{receiver}.{name}" in function_types:
+                    targets = [f"{receiver}.{name}"]
+                elif kind == 'module' and function_types.get(name) == 'function':
+                    targets = [name]
+                else:
+                    targets = []
+                    candidates = methods_by_name.get(name, [])
+
+                for target in targets:
+                    if target != caller:
+                        self.graph.add_edge(caller, target, type="calls", relationship="calls")
+                for target in candidates:
+                    # Never downgrade a certain call found elsewhere in the function
+                    if target != caller and not self.graph.has_edge(caller, target):
+                        self.graph.add_edge(caller, target, type="may_call", relationship="may_call")
 
     def _analyze_dead_code(self):
         """Identify potentially dead code."""
@@ -238,4 +397,25 @@ class ProjectAnalyzer:
                 
                 if 'metadata' not in data:
                     data['metadata'] = {}
-                data['metadata']['is_dead_code'] = is_dead
\ No newline at end of file
+                data['metadata']['is_dead_code'] = is_dead
+
+    def _analyze_duplicates(self):
+        """Mark copy-pasted functions and link near-duplicate ones."""
+        duplicate_of, similar = self.metrics_analyzer.detect_duplicates()
+
+        for copy, original in duplicate_of.items():
+            if copy not in self.graph or original not in self.graph:
+                continue
+            metadata = self.graph.nodes[copy].setdefault('metadata', {})
+            metadata['duplicate_of'] = original
+            metadata.setdefault('code_smells', []).append(f"Duplicate code (copy of {original})")
+
+        for first, second, similarity in similar:
+            if first in self.graph and second in self.graph:
+                self.graph.add_edge(
+                    first,
+                    second,
+                    type="similar_to",
+                    relationship="similar_to",
+                    similarity=round(similarity, 2)
+                )
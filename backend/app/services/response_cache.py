@@ -0,0 +1,204 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from . import ANALYZER_VERSION
+
+
+class CacheEntry:
+    def __init__(self, body: bytes, graph=None):
+        self.body = body
+        # Parsed graph, only kept in memory so exports can reuse it
+        self.graph = graph
+
+
+class ResponseCache:
+    """Size-bounded LRU of serialized responses keyed by a content hash.
+
+    Entries can optionally be mirrored to a directory so that several worker
+    processes on the same host share results. ``max_bytes`` bounds the bodies;
+    the parsed graphs kept alongside them are not measured, so ``max_entries``
+    bounds how many are held.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 512 * 1024 * 1024, max_entries: int = 256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._disk_writes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(content: str, input_type: str) -> str:
+        """Hash the request content together with its type and the analyzer version."""
+        digest = hashlib.sha256()
+        digest.update(f"{ANALYZER_VERSION}\0{input_type}\0".encode())
+        digest.update(content.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def etag_for(key: str) -> str:
+        return f'"{key}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], key: str) -> bool:
+        """Check an If-None-Match header value against a cache key."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            # "*" is not honoured: a POST body never seen before has no cached response to reuse
+            if tag.strip('"') == key:
+                return True
+        return False
+
+    def get(self, key: str, require_graph: bool = False) -> Optional[CacheEntry]:
+        """Return the cached entry for a key, checking memory first and then disk.
+
+        With ``require_graph``, entries without a parsed graph count as misses;
+        entries read from disk never have one.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and not require_graph:
+            body = self._read_disk(key)
+            if body is not None:
+                entry = CacheEntry(body)
+                self._store(key, entry)
+
+        if require_graph and entry is not None and entry.graph is None:
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.bytes_saved += len(entry.body)
+        return entry
+
+    def put(self, key: str, body: bytes, graph=None) -> CacheEntry:
+        """Cache a serialized response and mirror it to disk when configured."""
+        entry = CacheEntry(body, graph)
+        self._store(key, entry)
+        self._write_disk(key, body)
+        return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Return the in-memory entry for a key without touching the statistics."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def record_not_modified(self, key: str):
+        """Count a 304 answer, crediting the body size when it is known."""
+        entry = self.peek(key)
+        with self._lock:
+            self.not_modified += 1
+            if entry is not None:
+                self.bytes_saved += len(entry.body)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            # A 304 also avoids regenerating the response, so it counts as a hit here
+            requests = lookups + self.not_modified
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'hit_ratio': (self.hits + self.not_modified) / requests if requests else 0.0,
+                'body_hit_ratio': self.hits / lookups if lookups else 0.0,
+                'bytes_saved': self.bytes_saved,
+                'shared_dir': self.cache_dir
+            }
+
+    def _store(self, key: str, entry: CacheEntry):
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.body)
+            self._entries[key] = entry
+            self._size += size
+            # Evict least recently used entries until we fit again
+            while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, body: bytes):
+        if not self.cache_dir:
+            return
+        try:
+            # Write to a temporary file first so other workers never read partial entries
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(temp_path, self._disk_path(key))
+        except OSError as e:
+            print(f"Error writing cache entry {key}: {str(e)}")
+            return
+
+        self._disk_writes += 1
+        if self._disk_writes % 100 == 0:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete the oldest shared entries once the directory exceeds its budget."""
+        files = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name))
+            total += stat.st_size
+
+        for _, size, name in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,57 @@
+"""Benchmark clone detection to check it scales roughly linearly.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_clone_detection
+"""
+import ast
+import random
+import time
+
+from app.services.clone_detector import CloneDetector
+
+STATEMENTS = [
+    "total = total + item",
+    "if item > limit:\n        count += 1",
+    "for value in values:\n        result.append(value * 2)",
+    "while count < limit:\n        count = count + step",
+    "data = {'key': item, 'size': len(values)}",
+    "try:\n        result = process(item)\n    except ValueError:\n        result = None",
+    "name = str(item).strip().lower()",
+    "items = [x for x in values if x is not None]",
+    "return_value = compute(item, limit, step)",
+    "with open(path) as handle:\n        content = handle.read()",
+]
+
+
+def make_functions(count: int, seed: int = 0):
+    """Build parsed functions; every tenth one is a renamed copy of an earlier one."""
+    rng = random.Random(seed)
+    functions = []
+    for index in range(count):
+        if index % 10 == 9:
+            source = functions[rng.randrange(len(functions))][1].replace("item", "element")
+        else:
+            body = "\n    ".join(rng.choice(STATEMENTS) for _ in range(rng.randint(4, 10)))
+            source = f"def func_{index}(item, values, limit, step):\n    {body}\n    return total"
+        functions.append((f"func_{index}", source))
+    return [(name, ast.parse(source).body[0]) for name, source in functions]
+
+
+def run(count: int):
+    functions = make_functions(count)
+    detector = CloneDetector()
+
+    start = time.perf_counter()
+    for name, node in functions:
+        detector.add_function(name, node)
+    duplicate_of, similar = detector.find_clones()
+    elapsed = time.perf_counter() - start
+
+    print(f"{count:>8} functions  {elapsed:8.2f}s  {elapsed / count * 1e6:8.1f}us/function  "
+          f"{len(duplicate_of):>6} exact  {len(similar):>7} similar pairs")
+
+
+if __name__ == "__main__":
+    for size in (1000, 2000, 4000, 8000, 16000):
+        run(size)
@@ -0,0 +1,104 @@
+"""Compare payload size and encode/decode time of the graph response formats.
+
+"decode ms" is decompressing and parsing the body into the format's own
+layout; for the binary format that is zero-copy views over typed columns, as
+the frontend reads it. "expand ms" is the extra time to build one dict per
+node and edge from the columnar formats, for consumers that need objects.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_graph_encoding
+"""
+import gzip
+import json
+import random
+import time
+
+import networkx as nx
+
+from app.services import graph_encoding
+from app.services.graph_encoding import (
+    BINARY_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE, JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE,
+    columns_to_dict, compress, decode_binary, encode_graph
+)
+
+
+def make_graph(functions: int, seed: int = 0) -> nx.DiGraph:
+    """Build a graph shaped like ProjectAnalyzer output."""
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    files = max(functions // 20, 1)
+    for index in range(files):
+        graph.add_node(f"module_{index}.py", type="file",
+                       metadata={'loc': rng.randint(50, 2000), 'functions': 0, 'classes': 0, 'imports': 0})
+    for index in range(functions):
+        name = f"function_{index}"
+        graph.add_node(name, type="function", metadata={
+            'complexity': rng.randint(1, 20),
+            'lines': rng.randint(3, 120),
+            'parameters': rng.randint(0, 6),
+            'docstring': "No documentation",
+            'line_number': rng.randint(1, 2000),
+            'args': ['self', 'value', 'options'][:rng.randint(0, 3)],
+            'code_smells': [],
+            'is_dead_code': rng.random() < 0.1
+        })
+        graph.add_edge(f"module_{index % files}.py", name, type="contains", relationship="contains")
+    for _ in range(functions * 3):
+        source, target = rng.randrange(functions), rng.randrange(functions)
+        graph.add_edge(f"function_{source}", f"function_{target}", type="calls", relationship="calls")
+    return graph
+
+
+def decompress(body: bytes, encoding):
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "br":
+        return graph_encoding.brotli.decompress(body)
+    return body
+
+
+def decode(body: bytes, media_type: str):
+    if media_type == BINARY_MEDIA_TYPE:
+        return decode_binary(body)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return graph_encoding.msgpack.unpackb(body)
+    return json.loads(body)
+
+
+def run(functions: int):
+    graph = make_graph(functions)
+    print(f"\n{graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+    print(f"{'format':<50}{'bytes':>12}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}{'expand ms':>12}")
+
+    baseline = None
+    for media_type in (JSON_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, BINARY_MEDIA_TYPE):
+        if media_type == MSGPACK_MEDIA_TYPE and graph_encoding.msgpack is None:
+            continue
+        for encoding in (None, "gzip", "br"):
+            if encoding == "br" and graph_encoding.brotli is None:
+                continue
+
+            start = time.perf_counter()
+            body, applied = compress(encode_graph(graph, media_type), encoding)
+            encode_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            decoded = decode(decompress(body, applied), media_type)
+            decode_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if media_type != JSON_MEDIA_TYPE:
+                columns_to_dict(decoded)
+            expand_time = time.perf_counter() - start
+
+            if baseline is None:
+                baseline = len(body)
+            label = f"{media_type} + {encoding or 'identity'}"
+            print(f"{label:<50}{len(body):>12}{baseline / len(body):>7.1f}x"
+                  f"{encode_time * 1000:>12.1f}{decode_time * 1000:>12.1f}{expand_time * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    for size in (1000, 10000, 100000):
+        run(size)
@@ -0,0 +1,69 @@
+"""Measure throughput and memory growth of the streaming graph exporters.
+
+Run from the backend directory (edge count defaults to one million):
+
+    python -m benchmarks.bench_graph_exporters [edges]
+"""
+import os
+import random
+import resource
+import sys
+import time
+
+import networkx as nx
+
+from app.services.graph_exporters import EXPORTERS
+
+
+def make_graph(edges: int, seed: int = 0) -> nx.DiGraph:
+    """Build a call graph shaped like ProjectAnalyzer output with ten edges per function."""
+    rng = random.Random(seed)
+    functions = max(edges // 10, 2)
+    graph = nx.DiGraph()
+    for index in range(functions):
+        graph.add_node(f"function_{index}", type="function", metadata={
+            'complexity': rng.randint(1, 20),
+            'lines': rng.randint(3, 120),
+            'parameters': rng.randint(0, 6),
+            'docstring': "No documentation",
+            'line_number': rng.randint(1, 2000),
+            'args': ['self', 'value'],
+            'code_smells': [],
+            'is_dead_code': rng.random() < 0.1
+        })
+    added = 0
+    while added < edges:
+        source, target = f"function_{rng.randrange(functions)}", f"function_{rng.randrange(functions)}"
+        if not graph.has_edge(source, target):
+            graph.add_edge(source, target, type="calls", relationship="calls")
+            added += 1
+    return graph
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def run(edges: int):
+    graph = make_graph(edges)
+    print(f"{graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges, "
+          f"peak RSS after building graph {max_rss_mb():.0f} MB")
+    print(f"{'format':<10}{'MB written':>12}{'seconds':>10}{'edges/s':>12}{'MB/s':>8}{'peak RSS MB':>13}")
+
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        for name, (writer, _) in EXPORTERS.items():
+            written = 0
+            start = time.perf_counter()
+            for chunk in writer(graph):
+                sink.write(chunk)
+                written += len(chunk)
+            elapsed = time.perf_counter() - start
+            megabytes = written / 1e6
+            print(f"{name:<10}{megabytes:>12.1f}{elapsed:>10.2f}{edges / elapsed:>12.0f}"
+                  f"{megabytes / elapsed:>8.1f}{max_rss_mb():>13.0f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
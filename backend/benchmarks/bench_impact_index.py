@@ -0,0 +1,99 @@
+"""Measure impact index build time, memory and query latency on a large call graph.
+
+Run from the backend directory (function count defaults to 300k):
+
+    python -m benchmarks.bench_impact_index [functions]
+"""
+import os
+import random
+import sys
+import time
+
+import networkx as nx
+
+from app.services.impact_index import ImpactIndex
+
+PACKAGE_SIZE = 1000
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process (Linux)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def make_graph(functions: int, seed: int = 0) -> nx.DiGraph:
+    """Build a mostly acyclic layered call graph, like a real project.
+
+    Functions are grouped into packages. Calls go "down" to nearby functions
+    of the same package, a few cross into shared utility packages at the end,
+    and a very few go back up a couple of functions to form small recursive
+    cycles. Tests each exercise a handful of functions of one package.
+    """
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    tests = functions // 10
+    for index in range(functions):
+        name = f"test_{index}" if index < tests else f"function_{index}"
+        graph.add_node(name, type="function", metadata={})
+    names = list(graph.nodes)
+    utilities = functions - functions // 10
+
+    for index in range(tests):
+        # Tests are laid out like test modules, one run of tests per package
+        package_start = tests + index * max(1, (utilities - tests) // PACKAGE_SIZE) // tests * PACKAGE_SIZE
+        for _ in range(3):
+            target = rng.randrange(package_start, min(package_start + PACKAGE_SIZE, functions))
+            graph.add_edge(names[index], names[target], type="calls", relationship="calls")
+
+    for index in range(tests, functions):
+        package_end = min(tests + ((index - tests) // PACKAGE_SIZE + 1) * PACKAGE_SIZE, functions)
+        for _ in range(3):
+            roll = rng.random()
+            if roll < 0.005 and package_end <= utilities:
+                target = rng.randrange(utilities, functions)
+            elif roll < 0.006 and index - 3 > tests:
+                target = rng.randrange(index - 3, index)
+            elif index + 1 < package_end:
+                target = rng.randrange(index + 1, min(index + 50, package_end))
+            else:
+                continue
+            graph.add_edge(names[index], names[target], type="calls", relationship="calls")
+    return graph
+
+
+def run(functions: int):
+    graph = make_graph(functions)
+    print(f"{graph.number_of_nodes()} functions, {graph.number_of_edges()} call edges")
+
+    before = rss_mb()
+    start = time.perf_counter()
+    index = ImpactIndex(graph)
+    elapsed = time.perf_counter() - start
+    grown = rss_mb() - before
+    bitset_mb = sum(sys.getsizeof(value) for _, value in set(index.reached_by)) / 2 ** 20
+    largest_component = max(len(members) for members in nx.strongly_connected_components(graph))
+    print(f"index built in {elapsed:.2f}s: {len(index.targets)} tests/entry points, "
+          f"largest cycle {largest_component} functions")
+    print(f"{index.distinct_bitsets} distinct bitsets holding {bitset_mb:.1f} MB, "
+          f"RSS grew {grown:.0f} MB while building")
+
+    rng = random.Random(1)
+    names = [node for node in graph.nodes if not node.startswith("test_")]
+    for changed in (1, 10, 100):
+        timings, hits = [], []
+        for _ in range(20):
+            symbols = rng.sample(names, changed)
+            start = time.perf_counter()
+            result = index.query(symbols=symbols)
+            timings.append(time.perf_counter() - start)
+            hits.append(len(result['tests']))
+        timings.sort()
+        hits.sort()
+        print(f"{changed:>4} changed symbols: median {timings[len(timings) // 2] * 1000:.2f} ms, "
+              f"max {timings[-1] * 1000:.2f} ms, median {hits[len(hits) // 2]} of {graph.number_of_nodes() // 10} "
+              f"tests selected")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
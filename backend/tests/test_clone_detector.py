@@ -0,0 +1,91 @@
+import ast
+
+from app.services.clone_detector import CloneDetector
+from app.services.project_analyzer import ProjectAnalyzer
+
+TEMPLATE = '''def {name}(items, limit):
+    """{doc}"""
+    total = 0
+    seen = set()
+    for item in items:
+        if item in seen:
+            continue
+        seen.add(item)
+        if item > limit:
+            total += item * 2
+        else:
+            total -= 1
+    result = []
+    for value in sorted(seen):
+        if value % 2 == 0:
+            result.append(value + total)
+    {tail}
+    return result, total
+'''
+
+
+def _function(name, doc='Sum the items.', tail='count = len(result)'):
+    return TEMPLATE.format(name=name, doc=doc, tail=tail)
+
+
+def _analyze(tmp_path, files):
+    for name, source in files.items():
+        (tmp_path / name).write_text(source)
+    return ProjectAnalyzer().analyze_project(str(tmp_path))
+
+
+def _similar(graph, first, second):
+    return any(
+        graph.has_edge(a, b) and graph.edges[a, b].get('type') == 'similar_to'
+        for a, b in ((first, second), (second, first))
+    )
+
+
+def test_renamed_copy_is_a_duplicate(tmp_path):
+    graph = _analyze(tmp_path, {
+        'a.py': _function('original'),
+        'b.py': _function('renamed'),
+    })
+
+    assert graph.nodes['renamed']['metadata']['duplicate_of'] == 'original'
+    assert 'duplicate_of' not in graph.nodes['original']['metadata']
+
+
+def test_docstring_difference_is_still_an_exact_clone(tmp_path):
+    graph = _analyze(tmp_path, {
+        'a.py': _function('original'),
+        'b.py': _function('documented', doc='A completely different explanation.'),
+    })
+
+    assert graph.nodes['documented']['metadata']['duplicate_of'] == 'original'
+
+
+def test_one_statement_edit_is_similar(tmp_path):
+    graph = _analyze(tmp_path, {
+        'a.py': _function('original'),
+        'b.py': _function('edited', tail='print(total)'),
+    })
+
+    assert 'duplicate_of' not in graph.nodes['edited']['metadata']
+    assert _similar(graph, 'original', 'edited')
+
+
+def test_small_functions_are_ignored(tmp_path):
+    small = "def {name}(x):\n    return x + 1\n"
+    graph = _analyze(tmp_path, {
+        'a.py': small.format(name='inc'),
+        'b.py': small.format(name='bump'),
+    })
+
+    assert 'duplicate_of' not in graph.nodes['bump']['metadata']
+    assert not _similar(graph, 'inc', 'bump')
+
+
+def test_first_definition_keeps_its_signature():
+    detector = CloneDetector()
+    first = ast.parse(_function('run')).body[0]
+    second = ast.parse("def run(x):\n" + "    x = x + 1\n" * 20 + "    return x\n").body[0]
+    detector.add_function('run', first)
+    detector.add_function('run', second)
+
+    assert detector.signatures['run'] == detector.fingerprint(first)[1]
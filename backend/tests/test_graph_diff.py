@@ -0,0 +1,76 @@
+from app.services.graph_diff import GraphIndex, diff_graphs
+from app.services.project_analyzer import ProjectAnalyzer
+
+UNCHANGED = "def stable(x):\n    return x * 2\n"
+
+BASE = {
+    'stable.py': UNCHANGED,
+    'app.py': (
+        "def handler(x):\n    return x\n\n"
+        "def helper(x):\n    return x + 1\n\n"
+        "def legacy():\n    return 0\n"
+    ),
+}
+
+HEAD = {
+    'stable.py': UNCHANGED,
+    'app.py': (
+        "def handler(x):\n"
+        "    if x:\n        return helper(x)\n"
+        "    return 0\n\n"
+        "def helper(x):\n    return x + 1\n\n"
+        "def fresh():\n    return 1\n"
+    ),
+}
+
+
+def _analyze(path, files):
+    path.mkdir()
+    for name, source in files.items():
+        (path / name).write_text(source)
+    return ProjectAnalyzer().analyze_project(str(path))
+
+
+def _diff(tmp_path):
+    return _analyze(tmp_path / 'base', BASE), _analyze(tmp_path / 'head', HEAD)
+
+
+def test_added_removed_and_modified_symbols(tmp_path):
+    result = diff_graphs(*_diff(tmp_path))
+
+    assert result['added'] == [{'id': 'app.py::fresh', 'type': 'function'}]
+    assert result['removed'] == [{'id': 'app.py::legacy', 'type': 'function'}]
+
+    modified = {entry['id']: entry for entry in result['modified']}
+    assert modified['app.py::handler']['complexity_delta'] == 1
+    assert modified['app.py::handler']['changes']['complexity'] == [1, 2]
+
+
+def test_edge_changes_and_dead_code_transitions(tmp_path):
+    result = diff_graphs(*_diff(tmp_path))
+
+    assert ('app.py::handler', 'app.py::helper', 'calls') in result['edges_added']
+    assert 'app.py::helper' in result['no_longer_dead']
+    assert 'app.py::fresh' in result['became_dead']
+
+
+def test_unchanged_file_is_skipped(tmp_path, monkeypatch):
+    base, head = _diff(tmp_path)
+    GraphIndex.for_graph(base)
+    GraphIndex.for_graph(head)
+
+    visited = []
+    metadata = GraphIndex.metadata
+    monkeypatch.setattr(GraphIndex, 'metadata', lambda self, qid: visited.append(qid) or metadata(self, qid))
+    result = diff_graphs(base, head)
+
+    assert visited
+    assert not any(qid.startswith('stable.py') for qid in visited)
+    assert not any(entry['id'].startswith('stable.py') for entry in result['modified'])
+
+
+def test_identical_graphs_have_no_changes(tmp_path):
+    base = _analyze(tmp_path / 'base', BASE)
+    head = _analyze(tmp_path / 'head', BASE)
+
+    assert all(count == 0 for count in diff_graphs(base, head)['summary'].values())
@@ -0,0 +1,107 @@
+import gzip
+import json
+
+import brotli
+import msgpack
+import networkx as nx
+import pytest
+
+from app.services.graph_encoding import (
+    BINARY_MEDIA_TYPE,
+    COLUMNAR_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MIN_COMPRESS_BYTES,
+    MSGPACK_MEDIA_TYPE,
+    columns_to_dict,
+    compress,
+    decode_binary,
+    encode_graph,
+    graph_to_dict,
+    negotiate_encoding,
+    negotiate_media_type,
+)
+
+
+def _graph():
+    graph = nx.DiGraph()
+    graph.add_node('app.py', type='file', metadata={'lines': 40})
+    graph.add_node('handler', type='function', metadata={
+        'complexity': 3, 'is_dead_code': False, 'score': 0.5,
+        'smells': ['long_method'], 'docstring': 'Handle it.', 'params': {'x': 'int'},
+    })
+    graph.add_node('helper', type='function', metadata={
+        'complexity': 1, 'is_dead_code': True, 'smells': [], 'size': 2 ** 40,
+    })
+    graph.add_node('huge', type='function', metadata={'size': 2 ** 60, 'mixed': 1})
+    graph.add_node('Other', type='class', metadata={'mixed': 'one'})
+    graph.add_edge('app.py', 'handler', type='contains')
+    graph.add_edge('handler', 'helper', type='calls')
+    graph.add_edge('handler', 'Other', type='may_call')
+    return graph
+
+
+def _decode(body, media_type):
+    if media_type == JSON_MEDIA_TYPE:
+        return json.loads(body)
+    if media_type == COLUMNAR_MEDIA_TYPE:
+        return columns_to_dict(json.loads(body))
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return columns_to_dict(msgpack.unpackb(body))
+    return columns_to_dict(decode_binary(body))
+
+
+@pytest.mark.parametrize('media_type', [JSON_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, BINARY_MEDIA_TYPE])
+def test_every_format_round_trips(media_type):
+    graph = _graph()
+    assert _decode(encode_graph(graph, media_type), media_type) == graph_to_dict(graph)
+
+
+def test_binary_metadata_columns_are_typed():
+    metadata = decode_binary(encode_graph(_graph(), BINARY_MEDIA_TYPE))['nodes']['metadata']
+    kinds = {key: column['kind'] for key, column in metadata.items()}
+
+    assert kinds == {
+        'lines': 'int32', 'complexity': 'int32', 'is_dead_code': 'bool', 'score': 'float64',
+        'smells': 'string_list', 'docstring': 'string', 'params': 'json',
+        # Beyond float64 precision, and int mixed with str, fall back to JSON
+        'size': 'json', 'mixed': 'json',
+    }
+    assert isinstance(metadata['complexity']['values'], memoryview)
+
+
+def test_empty_graph_round_trips():
+    graph = nx.DiGraph()
+    body = encode_graph(graph, BINARY_MEDIA_TYPE)
+    assert columns_to_dict(decode_binary(body)) == {'nodes': [], 'edges': []}
+
+
+def test_negotiate_media_type():
+    assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+    assert negotiate_media_type('*/*') == JSON_MEDIA_TYPE
+    assert negotiate_media_type('text/html') == JSON_MEDIA_TYPE
+    assert negotiate_media_type(f'{BINARY_MEDIA_TYPE}, application/json;q=0.5') == BINARY_MEDIA_TYPE
+    assert negotiate_media_type(f'{BINARY_MEDIA_TYPE};q=0.2, {MSGPACK_MEDIA_TYPE};q=0.8') == MSGPACK_MEDIA_TYPE
+    assert negotiate_media_type(f'{BINARY_MEDIA_TYPE};q=0') == JSON_MEDIA_TYPE
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding('identity') is None
+    assert negotiate_encoding('gzip, deflate, br') == 'br'
+    assert negotiate_encoding('br;q=0.1, gzip') == 'gzip'
+    assert negotiate_encoding('*') == 'br'
+    assert negotiate_encoding('*, br;q=0') == 'gzip'
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br'])
+def test_compress_round_trips(encoding):
+    body = encode_graph(_graph(), JSON_MEDIA_TYPE) * 20
+    compressed, applied = compress(body, encoding)
+
+    assert applied == encoding
+    assert (gzip.decompress if encoding == 'gzip' else brotli.decompress)(compressed) == body
+
+
+def test_small_bodies_are_not_compressed():
+    body = b'x' * (MIN_COMPRESS_BYTES - 1)
+    assert compress(body, 'gzip') == (body, None)
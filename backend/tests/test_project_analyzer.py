@@ -0,0 +1,80 @@
+from app.services.impact_index import ImpactIndex
+from app.services.project_analyzer import ProjectAnalyzer
+
+
+def _analyze(tmp_path, files):
+    for name, source in files.items():
+        (tmp_path / name).write_text(source)
+    return ProjectAnalyzer().analyze_project(str(tmp_path))
+
+
+def _callees(graph, caller, edge_type='calls'):
+    return {target for _, target, data in graph.out_edges(caller, data=True) if data.get('type') == edge_type}
+
+
+def test_ambiguous_method_call_links_every_candidate(tmp_path):
+    graph = _analyze(tmp_path, {
+        'a.py': "class Runner:\n    def run(self):\n        return 1\n",
+        'b.py': "class Worker:\n    def run(self):\n        return 2\n",
+        'test_worker.py': (
+            "from b import Worker\n\n"
+            "def test_worker():\n"
+            "    w = Worker()\n"
+            "    assert w.run() == 2\n"
+        ),
+    })
+
+    assert _callees(graph, 'test_worker') == set()
+    assert _callees(graph, 'test_worker', 'may_call') == {'Runner.run', 'Worker.run'}
+    # Possible callers don't keep a method alive
+    assert graph.nodes['Worker.run']['metadata']['is_dead_code']
+    impact = ImpactIndex(graph).query(files=['b.py'], symbols=['b.py::Worker.run'])
+    assert impact['tests'] == ['test_worker']
+
+
+def test_exact_calls_get_a_single_edge(tmp_path):
+    graph = _analyze(tmp_path, {
+        'a.py': (
+            "class Runner:\n"
+            "    def run(self):\n        return self.step()\n"
+            "    def step(self):\n        return 1\n"
+        ),
+        'b.py': (
+            "import os\n\n"
+            "class Cache:\n"
+            "    def get(self, key):\n        return key\n\n"
+            "def get(key):\n    return key\n\n"
+            "def main():\n    return {}.get('x'), os.path.join('a'), make().get('y')\n"
+        ),
+    })
+
+    assert _callees(graph, 'Runner.run') == {'Runner.step'}
+    assert _callees(graph, 'Runner.run', 'may_call') == set()
+    # Calls on literals, attribute chains and call results are not linked at all
+    assert _callees(graph, 'main') == set()
+    assert _callees(graph, 'main', 'may_call') == set()
+
+
+def test_only_pytest_tests_are_selected(tmp_path):
+    graph = _analyze(tmp_path, {
+        'conn.py': (
+            "class Connection:\n"
+            "    def open(self):\n        return 1\n"
+            "    def test_connection(self):\n        return self.open()\n\n"
+            "class TestResultFormatter:\n"
+            "    def render(self, c):\n        return Connection.open(c)\n\n"
+            "def testimony_parser(c):\n    return Connection.open(c)\n"
+        ),
+        'test_conn.py': (
+            "from conn import Connection\n\n"
+            "def _make_fixture():\n    return Connection.open(None)\n\n"
+            "def test_open():\n    return Connection.open(None)\n\n"
+            "class TestConnection:\n"
+            "    def test_open(self):\n        return Connection.open(None)\n"
+            "    def helper(self):\n        return Connection.open(None)\n"
+        ),
+    })
+
+    impact = ImpactIndex(graph).query(symbols=['Connection.open'])
+    assert impact['tests'] == ['TestConnection.test_open', 'test_open']
+    assert 'testimony_parser' in impact['entry_points']
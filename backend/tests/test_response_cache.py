@@ -0,0 +1,104 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.response_cache import ResponseCache
+
+ALPHA = b"def alpha():\n    return 1\n"
+BETA = b"def beta():\n    return 2\n"
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = ResponseCache(max_bytes=10)
+    cache.put('a', b'aaaa')
+    cache.put('b', b'bbbb')
+    cache.get('a')
+    cache.put('c', b'cccc')
+
+    assert cache.peek('b') is None
+    assert cache.peek('a') is not None and cache.peek('c') is not None
+    assert cache.stats()['size_bytes'] == 8
+
+
+def test_evicts_least_recently_used_by_entries():
+    cache = ResponseCache(max_entries=2)
+    cache.put('a', b'a')
+    cache.put('b', b'b')
+    cache.get('a')
+    cache.put('c', b'c')
+
+    assert cache.peek('b') is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_oversized_bodies_are_not_cached():
+    cache = ResponseCache(max_bytes=2)
+    cache.put('a', b'aaa')
+    assert cache.get('a') is None
+
+
+@pytest.mark.parametrize('header, matches', [
+    ('"key"', True),
+    ('W/"key"', True),
+    ('"other", W/"key"', True),
+    ('"other" ,"key"', True),
+    ('"other"', False),
+    ('*', False),
+    (None, False),
+])
+def test_etag_matching(header, matches):
+    assert ResponseCache.etag_matches(header, 'key') is matches
+
+
+def test_hit_ratio_counts_not_modified():
+    cache = ResponseCache()
+    cache.get('a')
+    cache.put('a', b'body')
+    cache.get('a')
+    cache.record_not_modified('a')
+    cache.record_not_modified('a')
+
+    stats = cache.stats()
+    assert stats['hit_ratio'] == 0.75
+    assert stats['body_hit_ratio'] == 0.5
+    assert stats['bytes_saved'] == 12
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(routes, 'response_cache', ResponseCache())
+    yield TestClient(app)
+    if hasattr(routes.router, 'current_analysis'):
+        del routes.router.current_analysis
+
+
+def _upload(client, source, etag=None):
+    headers = {'If-None-Match': etag} if etag else {}
+    return client.post('/upload-file/', files={'file': ('main.py', source)}, headers=headers)
+
+
+def _exported_nodes(client):
+    return [node['id'] for node in client.get('/export/json').json()['nodes']]
+
+
+def test_upload_not_modified_restores_its_graph(client):
+    etag = _upload(client, ALPHA).headers['etag']
+    _upload(client, BETA)
+    assert _exported_nodes(client) == ['beta']
+
+    response = _upload(client, ALPHA, etag)
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+    assert _exported_nodes(client) == ['alpha']
+
+
+def test_upload_regenerates_when_graph_is_gone(client, monkeypatch):
+    etag = _upload(client, ALPHA).headers['etag']
+    _upload(client, BETA)
+    monkeypatch.setattr(routes, 'response_cache', ResponseCache())
+
+    response = _upload(client, ALPHA, etag)
+    assert response.status_code == 200
+    assert response.headers['x-cache'] == 'MISS'
+    assert _exported_nodes(client) == ['alpha']
@@ -2,13 +2,14 @@ import React, { useState } from 'react';
 import { Card, CardHeader, CardTitle, CardContent } from './ui/card';
 import ProjectUploader from './ProjectUploader';
 import ProjectGraph from './ProjectGraph';
+import { isGraphColumns } from '../lib/graphCodec';
 
 const FlowchartViewer = () => {
   const [graphData, setGraphData] = useState(null);
 
   const handleUploadSuccess = (data) => {
     // Ensure data has the correct structure
-    if (data && data.nodes && data.edges) {
+    if (data && (isGraphColumns(data) || (data.nodes && data.edges))) {
       setGraphData(data);
     } else {
       console.error('Invalid data structure:', data);
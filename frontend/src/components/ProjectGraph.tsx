@@ -6,6 +6,7 @@ import popper from 'cytoscape-popper';
 import tippy from 'tippy.js';
 import 'tippy.js/dist/tippy.css';
 import { API_URL } from '../config';
+import { isGraphColumns, metadataValue, nodeMetadata } from '../lib/graphCodec';
 
 // Register the required extensions
 Cytoscape.use(dagre);
@@ -64,6 +65,10 @@ const Legend = () => (
         <div className="w-8 h-0.5 border-t-2 border-dashed border-emerald-500 mr-2"></div>
         <span className="text-sm text-gray-600">Imports</span>
       </div>
+      <div className="flex items-center">
+        <div className="w-8 h-0.5 border-t-2 border-dotted border-orange-500 mr-2"></div>
+        <span className="text-sm text-gray-600">Similar code</span>
+      </div>
       <div className="mt-4 pt-2 border-t">
         <p className="text-xs text-gray-500">
           Node colors indicate complexity:<br/>
@@ -85,16 +90,56 @@ const ProjectGraph = ({ data }) => {
   const cyRef = useRef(null);
 
   const elements = useMemo(() => {
+    // Style fields are flattened onto each element; the full metadata of a
+    // binary graph is only expanded for the node under the tooltip
+    if (isGraphColumns(data)) {
+      const complexity = data.metadata.complexity;
+      const smells = data.metadata.code_smells;
+      const nodes = new Array(data.nodeCount);
+      for (let i = 0; i < data.nodeCount; i++) {
+        nodes[i] = {
+          data: {
+            id: data.strings[i],
+            label: data.strings[i],
+            type: data.strings[data.nodeTypes[i]],
+            index: i,
+            complexity: complexity ? metadataValue(data, 'complexity', i) || 0 : 0,
+            smells: smells?.kind === 'string_list' ? smells.offsets[i + 1] - smells.offsets[i] : 0,
+            dead: metadataValue(data, 'is_dead_code', i) === true
+          }
+        };
+      }
+
+      const mayCall = data.strings.indexOf('may_call');
+      const edges = [];
+      for (let i = 0; i < data.edgeCount; i++) {
+        if (data.edgeTypes[i] === mayCall) continue;
+        edges.push({
+          data: {
+            id: `e${i}`,
+            source: data.strings[data.sources[i]],
+            target: data.strings[data.targets[i]],
+            type: data.strings[data.edgeTypes[i]]
+          }
+        });
+      }
+      return [...nodes, ...edges];
+    }
+
     const nodes = data.nodes.map(node => ({
       data: {
         ...node,
         id: node.id,
         label: node.label,
-        type: node.type
+        type: node.type,
+        complexity: node.metadata?.complexity || 0,
+        smells: node.metadata?.code_smells?.length || 0,
+        dead: Boolean(node.metadata?.is_dead_code)
       }
     }));
 
-    const edges = data.edges.map((edge, index) => ({
+    // may_call edges only list possible targets for impact analysis; don't draw them
+    const edges = data.edges.filter(edge => edge.type !== 'may_call').map((edge, index) => ({
       data: {
         id: `e${index}`,
         source: edge.source,
@@ -166,21 +211,21 @@ const ProjectGraph = ({ data }) => {
       style: {
         'shape': 'roundrectangle',
         'background-color': (ele) => {
-          const complexity = ele.data('metadata')?.complexity || 0;
+          const complexity = ele.data('complexity');
           if (complexity <= 5) return '#4ade80';  // Simple - Green
           if (complexity <= 10) return '#fbbf24'; // Moderate - Yellow
           return '#ef4444';  // Complex - Red
         },
         'border-width': (ele) => {
-          const smells = ele.data('metadata')?.code_smells?.length || 0;
+          const smells = ele.data('smells');
           return smells > 0 ? 4 : 2;
         },
         'border-color': (ele) => {
-          const smells = ele.data('metadata')?.code_smells?.length || 0;
+          const smells = ele.data('smells');
           return smells > 0 ? '#ef4444' : '#4f46e5';
         },
         'border-style': (ele) => {
-          return ele.data('metadata')?.is_dead_code ? 'dashed' : 'solid';
+          return ele.data('dead') ? 'dashed' : 'solid';
         }
       }
     },
@@ -190,21 +235,21 @@ const ProjectGraph = ({ data }) => {
       style: {
         'shape': 'roundrectangle',
         'background-color': (ele) => {
-          const complexity = ele.data('metadata')?.complexity || 0;
+          const complexity = ele.data('complexity');
           if (complexity <= 5) return '#4ade80';  // Simple - Green
           if (complexity <= 10) return '#fbbf24'; // Moderate - Yellow
           return '#ef4444';  // Complex - Red
         },
         'border-width': (ele) => {
-          const smells = ele.data('metadata')?.code_smells?.length || 0;
+          const smells = ele.data('smells');
           return smells > 0 ? 4 : 2;
         },
         'border-color': (ele) => {
-          const smells = ele.data('metadata')?.code_smells?.length || 0;
+          const smells = ele.data('smells');
           return smells > 0 ? '#ef4444' : '#7c3aed';
         },
         'border-style': (ele) => {
-          return ele.data('metadata')?.is_dead_code ? 'dashed' : 'solid';
+          return ele.data('dead') ? 'dashed' : 'solid';
         }
       }
     },
@@ -256,6 +301,15 @@ const ProjectGraph = ({ data }) => {
         'target-arrow-color': '#10b981',
         'line-style': 'dashed'
       }
+    },
+    // Near-duplicate code
+    {
+      selector: 'edge[type = "similar_to"]',
+      style: {
+        'line-color': '#f97316',
+        'target-arrow-color': '#f97316',
+        'line-style': 'dotted'
+      }
     }
 ];
 
@@ -263,13 +317,14 @@ const ProjectGraph = ({ data }) => {
   useEffect(() => {
     if (cyRef.current) {
       const cy = cyRef.current;
+      const graph = data;
 
       // Add tooltips using native Cytoscape events
       cy.nodes().unbind('mouseover');
       cy.nodes().bind('mouseover', (event) => {
         const node = event.target;
         const data = node.data();
-        const metadata = data.metadata || {};
+        const metadata = isGraphColumns(graph) ? nodeMetadata(graph, data.index) : data.metadata || {};
         
         const renderedPosition = node.renderedPosition();
         const tooltip = document.createElement('div');
@@ -285,6 +340,9 @@ const ProjectGraph = ({ data }) => {
             ${metadata.is_dead_code ? 
                 '<p class="text-red-600 font-medium">⚠️ Potentially Dead Code</p>' 
                 : ''}
+            ${metadata.duplicate_of ? 
+                `<p class="text-orange-600 font-medium">Duplicate of ${metadata.duplicate_of}</p>` 
+                : ''}
             ${metadata.code_smells?.length ? `
                 <div class="mt-2">
                 <span class="font-medium text-red-600">Code Smells:</span>
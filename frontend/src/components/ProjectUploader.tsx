@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { Card, CardHeader, CardTitle, CardContent } from './ui/card';
 import { API_URL } from '../config';
+import { BINARY_GRAPH_MEDIA_TYPE, readGraphResponse } from '../lib/graphCodec';
 const ProjectUploader = ({ onUploadSuccess }) => {
     const [uploadType, setUploadType] = useState('file');
     const [loading, setLoading] = useState(false);
@@ -22,13 +23,14 @@ const ProjectUploader = ({ onUploadSuccess }) => {
       const response = await fetch(`${API_URL}${endpoint}`, {
         method: 'POST',
         body: formData,
+        headers: uploadType === 'file' ? {} : { Accept: `${BINARY_GRAPH_MEDIA_TYPE}, application/json;q=0.5` },
       });
 
       if (!response.ok) {
         throw new Error('Upload failed');
       }
 
-      const data = await response.json();
+      const data = await readGraphResponse(response);
       onUploadSuccess(data);
     } catch (err) {
       setError(err.message);
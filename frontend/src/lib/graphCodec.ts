@@ -0,0 +1,137 @@
+export const BINARY_GRAPH_MEDIA_TYPE = 'application/vnd.codeflow.graph';
+
+export interface GraphNode {
+  id: string;
+  label: string;
+  type: string;
+  metadata: Record<string, unknown>;
+}
+
+export interface GraphEdge {
+  source: string;
+  target: string;
+  type: string;
+}
+
+export interface GraphData {
+  nodes: GraphNode[];
+  edges: GraphEdge[];
+}
+
+const MISSING_INT32 = -(2 ** 31);
+const MISSING_BOOL = 2;
+const MISSING_STRING = 0xffffffff;
+
+export type MetadataColumn =
+  | { kind: 'int32'; values: Int32Array }
+  | { kind: 'float64'; values: Float64Array }
+  | { kind: 'bool'; values: Uint8Array }
+  | { kind: 'string'; values: Uint32Array }
+  | { kind: 'string_list'; present: Uint8Array; offsets: Uint32Array; values: Uint32Array }
+  | { kind: 'json'; values: unknown[] };
+
+// A decoded CFG2 payload. Node i has id strings[i]; every array is a view over the response buffer.
+export interface GraphColumns {
+  strings: string[];
+  nodeCount: number;
+  edgeCount: number;
+  nodeTypes: Uint32Array;
+  sources: Uint32Array;
+  targets: Uint32Array;
+  edgeTypes: Uint32Array;
+  metadata: Record<string, MetadataColumn>;
+}
+
+export function isGraphColumns(graph: GraphData | GraphColumns): graph is GraphColumns {
+  return (graph as GraphColumns).nodeTypes !== undefined;
+}
+
+// Decode the CFG2 layout: magic, uint32 header length, JSON header, then 8-byte aligned
+// little-endian columns. Nothing is copied or expanded into per-node objects; read single
+// values with metadataValue() or nodeMetadata().
+export function decodeBinaryGraph(buffer: ArrayBuffer): GraphColumns {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== 'CFG2') {
+    throw new Error('Not a CodeFlow binary graph payload');
+  }
+
+  const headerLength = view.getUint32(4, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+  const { strings, node_count: nodeCount, edge_count: edgeCount } = header;
+
+  let offset = 8 + headerLength;
+  const read = <T>(ArrayType: { new (buffer: ArrayBuffer, offset: number, length: number): T; BYTES_PER_ELEMENT: number }, count: number): T => {
+    const column = new ArrayType(buffer, offset, count);
+    const size = count * ArrayType.BYTES_PER_ELEMENT;
+    offset += size + ((8 - (size % 8)) % 8);
+    return column;
+  };
+
+  const nodeTypes = read(Uint32Array, nodeCount);
+  const sources = read(Uint32Array, edgeCount);
+  const targets = read(Uint32Array, edgeCount);
+  const edgeTypes = read(Uint32Array, edgeCount);
+
+  const metadata: Record<string, MetadataColumn> = {};
+  for (const { key, kind, values, length } of header.metadata) {
+    if (kind === 'json') {
+      metadata[key] = { kind, values };
+    } else if (kind === 'int32') {
+      metadata[key] = { kind, values: read(Int32Array, nodeCount) };
+    } else if (kind === 'float64') {
+      metadata[key] = { kind, values: read(Float64Array, nodeCount) };
+    } else if (kind === 'bool') {
+      metadata[key] = { kind, values: read(Uint8Array, nodeCount) };
+    } else if (kind === 'string') {
+      metadata[key] = { kind, values: read(Uint32Array, nodeCount) };
+    } else {
+      const present = read(Uint8Array, nodeCount);
+      const offsets = read(Uint32Array, nodeCount + 1);
+      metadata[key] = { kind: 'string_list', present, offsets, values: read(Uint32Array, length) };
+    }
+  }
+
+  return { strings, nodeCount, edgeCount, nodeTypes, sources, targets, edgeTypes, metadata };
+}
+
+// Read one node's metadata value, or undefined when the node doesn't have the key.
+export function metadataValue(graph: GraphColumns, key: string, index: number): unknown {
+  const column = graph.metadata[key];
+  if (!column) return undefined;
+  switch (column.kind) {
+    case 'int32':
+      return column.values[index] === MISSING_INT32 ? undefined : column.values[index];
+    case 'float64':
+      return Number.isNaN(column.values[index]) ? undefined : column.values[index];
+    case 'bool':
+      return column.values[index] === MISSING_BOOL ? undefined : column.values[index] === 1;
+    case 'string':
+      return column.values[index] === MISSING_STRING ? undefined : graph.strings[column.values[index]];
+    case 'string_list': {
+      if (!column.present[index]) return undefined;
+      const items = column.values.subarray(column.offsets[index], column.offsets[index + 1]);
+      return Array.from(items, item => graph.strings[item]);
+    }
+    default:
+      return column.values[index] ?? undefined;
+  }
+}
+
+// Build a single node's metadata object, e.g. for a tooltip.
+export function nodeMetadata(graph: GraphColumns, index: number): Record<string, unknown> {
+  const metadata: Record<string, unknown> = {};
+  for (const key of Object.keys(graph.metadata)) {
+    const value = metadataValue(graph, key, index);
+    if (value !== undefined) metadata[key] = value;
+  }
+  return metadata;
+}
+
+export async function readGraphResponse(response: Response): Promise<GraphData | GraphColumns> {
+  const contentType = response.headers.get('content-type') || '';
+  if (contentType.startsWith(BINARY_GRAPH_MEDIA_TYPE)) {
+    return decodeBinaryGraph(await response.arrayBuffer());
+  }
+  return response.json();
+}